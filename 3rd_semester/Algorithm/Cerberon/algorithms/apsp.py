@@ -0,0 +1,104 @@
+import numpy as np
+
+class ShortestPathMatrix:
+    """All-pairs shortest distances and next hops for one graph.
+
+    ``dist[i, j]`` is the shortest distance between ``nodes[i]`` and
+    ``nodes[j]`` (inf when unreachable), ``next_hop[i, j]`` the index of the
+    first node after ``i`` on that route (-1 when unreachable) and
+    ``direct[i, j]`` the weight of the direct edge (inf when there is none).
+    """
+
+    def __init__(self, nodes, dist, next_hop, direct):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.dist = dist
+        self.next_hop = next_hop
+        self.direct = direct
+
+    @property
+    def negative_cycle(self):
+        """True when a negative cycle made the distances (and next hops)
+        meaningless; in an undirected graph any negative edge is one"""
+        return bool((np.diagonal(self.dist) < 0).any())
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def distance(self, u, v):
+        return self.dist[self.index[u], self.index[v]].item()
+
+    def has_edge(self, u, v):
+        return bool(np.isfinite(self.direct[self.index[u], self.index[v]]))
+
+    def path(self, u, v):
+        """Node list of the shortest route from u to v, or None"""
+        i, j = self.index[u], self.index[v]
+        if self.next_hop[i, j] == -1:
+            return None
+
+        path = [u]
+        while i != j:
+            # A simple path has at most n - 1 hops, more means the next hops loop
+            if len(path) > len(self.nodes):
+                raise ValueError(f"No simple route between {u} and {v}: the graph has a negative cycle")
+            i = self.next_hop[i, j]
+            path.append(self.nodes[i])
+        return path
+
+    def hop_cost(self, u, v):
+        """Cost of moving u -> v the way the TSP solvers do: the direct edge
+        if there is one, otherwise the shortest route"""
+        i, j = self.index[u], self.index[v]
+        direct = self.direct[i, j]
+        return (direct if np.isfinite(direct) else self.dist[i, j]).item()
+
+    def submatrices(self, nodes):
+        """``(direct, dist)`` restricted to ``nodes``, indexed by position"""
+        ids = [self.index[node] for node in nodes]
+        return self.direct[np.ix_(ids, ids)], self.dist[np.ix_(ids, ids)]
+
+    def hop_costs(self, nodes):
+        """``hop_cost`` for every ordered pair of ``nodes`` as an array"""
+        direct, dist = self.submatrices(nodes)
+        return np.where(np.isfinite(direct), direct, dist)
+
+    def expand(self, route):
+        """Expand consecutive stops of ``route`` into graph edges, using the
+        direct edge where it exists and the shortest route otherwise"""
+        edges = []
+        for u, v in zip(route[:-1], route[1:]):
+            if self.has_edge(u, v):
+                edges.append((u, v))
+            else:
+                path = self.path(u, v)
+                if path is None:
+                    raise ValueError(f"No route between {u} and {v}")
+                edges.extend(zip(path[:-1], path[1:]))
+        return edges
+
+def all_pairs_shortest_paths(G):
+    """Vectorized Floyd-Warshall over a networkx graph (directed or not)"""
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+
+    direct = np.full((n, n), np.inf)
+    for u, v, data in G.edges(data=True):
+        i, j = index[u], index[v]
+        direct[i, j] = data['weight']
+        if not G.is_directed():
+            direct[j, i] = data['weight']
+
+    dist = direct.copy()
+    np.fill_diagonal(dist, 0)
+    next_hop = np.where(np.isfinite(dist), np.arange(n, dtype=np.int32), -1).astype(np.int32)
+
+    for k in range(n):
+        via = dist[:, k, None] + dist[None, k, :]
+        better = via < dist
+        if better.any():
+            dist = np.where(better, via, dist)
+            next_hop = np.where(better, next_hop[:, k, None], next_hop)
+
+    return ShortestPathMatrix(nodes, dist, next_hop, direct)
@@ -6,6 +6,14 @@ from io import BytesIO
 import base64
 import networkx as nx
 import os
+from collections import deque
+import numpy as np
+from algorithms import csr_graph
+from algorithms.drawing import graph_drawing
+
+# Below this many edges the queue-based SPFA beats vectorized rounds
+VECTOR_MIN_EDGES = 1000
+ENGINES = ('auto', 'classic', 'vectorized', 'spfa')
 
 def load_network_graph(filename):
     """Load network graph with error handling"""
@@ -62,34 +70,214 @@ def bellman_ford_detection(graph, start_node):
     
     return distances, negative_edges
 
-def detect_suspicious_delays(graph_data, start_node):
+def edge_arrays(G):
+    """Node list plus (sources, targets, weights) NumPy edge arrays"""
+    if isinstance(G, csr_graph.CSRGraph):
+        return G.node_ids, G.edge_arrays()
+    
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    count = G.number_of_edges()
+    sources = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int32, count=count)
+    targets = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int32, count=count)
+    weights = np.fromiter((data['weight'] for _, _, data in G.edges(data=True)), dtype=np.float64, count=count)
+    return nodes, (sources, targets, weights)
+
+def bellman_ford_vectorized(num_nodes, sources, targets, weights, source):
+    """Bellman-Ford with whole-array relaxation rounds.
+
+    Every round relaxes all edges at once with ``np.minimum.at`` and the
+    loop stops as soon as a round changes nothing. Returns
+    (distances, predecessors, rounds) as arrays, -1 meaning no predecessor.
+    """
+    dist = np.full(num_nodes, np.inf)
+    dist[source] = 0
+    predecessors = np.full(num_nodes, -1, dtype=np.int64)
+    
+    rounds = 0
+    for _ in range(num_nodes - 1):
+        rounds += 1
+        candidates = dist[sources] + weights
+        relaxed = dist.copy()
+        np.minimum.at(relaxed, targets, candidates)
+        improved = relaxed < dist
+        if not improved.any():
+            break
+        
+        # Credit each improved node to an edge that achieved its new distance
+        winners = improved[targets] & (candidates == relaxed[targets])
+        predecessors[targets[winners]] = sources[winners]
+        dist = relaxed
+    
+    return dist, predecessors, rounds
+
+def spfa(num_nodes, sources, targets, weights, source):
+    """Queue-based Bellman-Ford (SPFA): only re-relax out-edges of nodes whose
+    distance changed. A node enqueued ``num_nodes`` times means a negative
+    cycle, in which case the search stops early.
+
+    Returns (distances, predecessors, rounds) like ``bellman_ford_vectorized``;
+    a round is one pass over the queue contents.
+    """
+    order = np.argsort(sources, kind='stable')
+    offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+    offsets, adjacent, costs = offsets.tolist(), targets[order].tolist(), weights[order].tolist()
+    
+    dist = [float('inf')] * num_nodes
+    predecessors = [-1] * num_nodes
+    enqueued = [0] * num_nodes
+    in_queue = bytearray(num_nodes)
+    dist[source] = 0
+    queue = deque([source])
+    in_queue[source] = 1
+    
+    rounds = 0
+    while queue and rounds < num_nodes:
+        rounds += 1
+        for _ in range(len(queue)):
+            u = queue.popleft()
+            in_queue[u] = 0
+            du = dist[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = adjacent[i]
+                if du + costs[i] < dist[v]:
+                    dist[v] = du + costs[i]
+                    predecessors[v] = u
+                    if not in_queue[v]:
+                        enqueued[v] += 1
+                        if enqueued[v] >= num_nodes:
+                            # Negative cycle, stop searching altogether
+                            return np.array(dist), np.array(predecessors, dtype=np.int64), rounds
+                        in_queue[v] = 1
+                        queue.append(v)
+    
+    return np.array(dist), np.array(predecessors, dtype=np.int64), rounds
+
+def extract_negative_cycles(predecessors, sources, targets, weights, relaxing, limit=10):
+    """Reconstruct distinct negative cycles from the predecessor array.
+
+    ``relaxing`` holds the indices of edges that still relax after the last
+    round; each one is relaxed once more and its head is walked back along
+    predecessors until the walk closes on itself. Every node is stamped by
+    the walk that first reached it, so walks that run into an earlier one
+    stop there and the whole extraction is O(V). Cycles are returned as node
+    index lists rotated to start at their smallest index, at most ``limit``.
+    """
+    predecessors = predecessors.copy()
+    predecessors[targets[relaxing]] = sources[relaxing]
+    predecessors = predecessors.tolist()
+    
+    weight_of = {}
+    for u, v, w in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+        weight_of[u, v] = min(w, weight_of.get((u, v), w))
+    
+    stamp = [0] * len(predecessors)
+    cycles = []
+    seen = set()
+    for walk, start in enumerate(dict.fromkeys(targets[relaxing].tolist()), 1):
+        node = start
+        while node != -1 and not stamp[node]:
+            stamp[node] = walk
+            node = predecessors[node]
+        if node == -1 or stamp[node] != walk:
+            continue  # dead end, or joined a walk that was already handled
+        
+        cycle = [node]
+        current = predecessors[node]
+        while current != node:
+            cycle.append(current)
+            current = predecessors[current]
+        cycle.reverse()  # predecessors point backwards
+        
+        smallest = cycle.index(min(cycle))
+        cycle = tuple(cycle[smallest:] + cycle[:smallest])
+        total = sum(weight_of[u, v] for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+        if cycle not in seen and total < 0:
+            seen.add(cycle)
+            cycles.append(list(cycle))
+            if len(cycles) >= limit:
+                break
+    
+    return cycles
+
+def run_bellman_ford(G, start_node, engine='auto', max_cycles=10):
+    """Run the selected Bellman-Ford engine.
+
+    Returns (distances, predecessors, negative_cycles, negative_edges,
+    engine, rounds) where ``engine`` is the one that actually ran. The
+    classic engine keeps no predecessors, so it reports no cycles and lists
+    every edge that still relaxes instead.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine}. Available engines: {list(ENGINES)}")
+    if start_node not in G:
+        raise ValueError(f"Start node {start_node} not in graph")
+    
+    if engine == 'classic':
+        detection = csr_graph.bellman_ford_detection if isinstance(G, csr_graph.CSRGraph) else bellman_ford_detection
+        distances, negative_edges = detection(G, start_node)
+        return distances, None, [], negative_edges, engine, len(G) - 1
+    
+    nodes, (sources, targets, weights) = edge_arrays(G)
+    if engine == 'auto':
+        engine = 'vectorized' if len(weights) >= VECTOR_MIN_EDGES else 'spfa'
+    
+    run = bellman_ford_vectorized if engine == 'vectorized' else spfa
+    dist, pred, rounds = run(len(nodes), sources, targets, weights, nodes.index(start_node))
+    
+    # Edges that still relax are on or behind a negative cycle
+    still_relaxing = np.flatnonzero(dist[sources] + weights < dist[targets])
+    cycles = []
+    if still_relaxing.size:
+        cycles = extract_negative_cycles(pred, sources, targets, weights, still_relaxing, max_cycles)
+    negative_cycles = [[nodes[i] for i in cycle] for cycle in cycles]
+    negative_edges = list(dict.fromkeys(
+        (cycle[i], cycle[(i + 1) % len(cycle)]) for cycle in negative_cycles for i in range(len(cycle))))
+    
+    distances = {node: dist[i].item() for i, node in enumerate(nodes)}
+    predecessors = {node: (nodes[pred[i]] if pred[i] != -1 else None) for i, node in enumerate(nodes)}
+    return distances, predecessors, negative_cycles, negative_edges, engine, rounds
+
+def detect_suspicious_delays(graph_data, start_node, G=None, engine='auto', max_cycles=10):
     """Main detection function with comprehensive validation"""
     try:
-        G = build_graph(graph_data)
+        if G is None:
+            G = build_graph(graph_data)
         
         # Validate start node
         if start_node not in G:
             available_nodes = list(G.nodes())
             raise ValueError(f"Start node {start_node} not found. Available nodes: {available_nodes}")
         
+        if isinstance(G, csr_graph.CSRGraph):
+            edges = list(G.edges())
+        else:
+            edges = [(u, v, data['weight']) for u, v, data in G.edges(data=True)]
+        
         # Calculate average latency
-        weights = [data['weight'] for _, _, data in G.edges(data=True)]
+        weights = [weight for _, _, weight in edges]
         avg_weight = sum(weights) / len(weights) if weights else 0
         
         # Identify suspicious edges (2x average latency)
         suspicious_edges = [
-            (u, v) for u, v, data in G.edges(data=True) 
-            if data['weight'] > 2 * avg_weight
+            (u, v) for u, v, weight in edges
+            if weight > 2 * avg_weight
         ] if avg_weight > 0 else []
         
         # Run Bellman-Ford
-        distances, negative_edges = bellman_ford_detection(G, start_node)
+        distances, predecessors, negative_cycles, negative_edges, engine, rounds = run_bellman_ford(
+            G, start_node, engine, max_cycles)
         
         return {
             'distances': distances,
+            'predecessors': predecessors,
             'suspicious_edges': suspicious_edges,
+            'negative_cycles': negative_cycles,
             'negative_cycle_edges': negative_edges,
             'average_latency': avg_weight,
+            'engine': engine,
+            'rounds': rounds,
             'status': 'success'
         }
     
@@ -98,17 +286,23 @@ def detect_suspicious_delays(graph_data, start_node):
             'status': 'error',
             'message': str(e),
             'distances': {},
+            'predecessors': {},
             'suspicious_edges': [],
+            'negative_cycles': [],
             'negative_cycle_edges': [],
-            'average_latency': 0
+            'average_latency': 0,
+            'engine': engine,
+            'rounds': 0
         }
 
-def visualize_suspicious_delays(graph_data, analysis):
+def visualize_suspicious_delays(graph_data, analysis, G=None, pos=None):
     """Visualization with robust error handling"""
     try:
         plt.figure(figsize=(14, 10))
-        G = build_graph(graph_data)
-        pos = nx.spring_layout(G, seed=42)
+        if G is None:
+            G = build_graph(graph_data)
+        if pos is None:
+            pos = nx.spring_layout(G, seed=42)
         
         # Node styling
         groups = set(nx.get_node_attributes(G, 'group').values())
@@ -124,12 +318,14 @@ def visualize_suspicious_delays(graph_data, analysis):
                 label=group
             )
         
-        # Edge styling
+        # Edge styling (sets, so each edge is classified in O(1))
+        suspicious = set(map(tuple, analysis.get('suspicious_edges', [])))
+        negative = set(map(tuple, analysis.get('negative_cycle_edges', [])))
         all_edges = list(G.edges())
         normal_edges = [
             e for e in all_edges
-            if e not in analysis.get('suspicious_edges', [])
-            and e not in analysis.get('negative_cycle_edges', [])
+            if e not in suspicious
+            and e not in negative
         ]
         
         if normal_edges:
@@ -185,4 +381,20 @@ def visualize_suspicious_delays(graph_data, analysis):
         plt.savefig(img, format='png')
         img.seek(0)
         plt.close()
-        return base64.b64encode(img.getvalue()).decode('utf-8')
\ No newline at end of file
+        return base64.b64encode(img.getvalue()).decode('utf-8')
+
+def suspicious_delays_drawing(graph_data, analysis, G=None, pos=None):
+    """Client-side counterpart of visualize_suspicious_delays"""
+    if G is None:
+        G = build_graph(graph_data)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42)
+    
+    distances = analysis.get('distances', {})
+    node_labels = {node: f"{attrs['label']} ({distances.get(node, '∞')}ms)" for node, attrs in G.nodes(data=True)}
+    return graph_drawing(G, pos, [
+        {'name': 'suspicious', 'label': 'High Latency',
+         'edges': [list(edge) for edge in analysis.get('suspicious_edges', [])]},
+        {'name': 'negative_cycle', 'label': 'Potential Issue',
+         'edges': [list(edge) for edge in analysis.get('negative_cycle_edges', [])]}
+    ], node_labels)
@@ -0,0 +1,368 @@
+"""Benchmark harness for the algorithms package.
+
+Every benchmark builds its input from a seeded generator outside the timed
+region, runs with step tracing off, and is timed with ``perf_counter_ns``
+after a warmup. Each size gets ``repeats`` samples summarized by median and
+interquartile range, and the medians across sizes are fitted against the
+usual complexity classes.
+
+    python -m algorithms.benchmark merge_sort quick_sort --max-size 65536 -o report.json
+    python -m algorithms.benchmark merge_sort bottom_up_merge_sort parallel_merge_sort --max-size 1048576
+"""
+import argparse
+import datetime
+import json
+import math
+import platform
+import random
+import string
+import sys
+import time
+from operator import itemgetter
+import numpy as np
+import networkx as nx
+from algorithms import csr_graph
+from algorithms.apsp import all_pairs_shortest_paths
+from algorithms.bellman_ford import run_bellman_ford
+from algorithms.bfs_dfs import bfs_path
+from algorithms.binary_search import binary_search, linear_search
+from algorithms.dijkstra import dijkstra_distances
+from algorithms.merge_sort import merge_sort
+from algorithms.parallel_sort import bottom_up_merge_sort, parallel_merge_sort
+from algorithms.quick_sort import introsort, quick_sort
+from algorithms.step_trace import StepTracer
+from algorithms.tree_traversal import traverse_tree
+from algorithms.tsp import held_karp_tsp
+
+# Each model maps n to the expected growth of the running time
+COMPLEXITY_MODELS = {
+    'O(1)': lambda n: np.ones_like(n),
+    'O(log n)': lambda n: np.log2(n),
+    'O(n)': lambda n: n,
+    'O(n log n)': lambda n: n * np.log2(n),
+    'O(n^2)': lambda n: n ** 2,
+    'O(n^3)': lambda n: n ** 3,
+    'O(n^2 2^n)': lambda n: n ** 2 * 2.0 ** n,
+}
+
+def geometric_sizes(min_size, max_size, factor=2):
+    """min_size, min_size*factor, ... up to max_size"""
+    sizes = []
+    n = min_size
+    while n <= max_size:
+        sizes.append(int(n))
+        n = max(n + 1, n * factor)
+    return sizes
+
+def random_words(n, rng, length=(4, 12)):
+    return [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(*length))) for _ in range(n)]
+
+def random_log_records(n, rng):
+    """(time_seconds, severity, log) tuples like analyze_logs sorts"""
+    severities = ['INFO', 'WARNING', 'ERROR', 'CRITICAL']
+    return [(rng.randrange(86400), rng.choice(severities), f"entry {i}") for i in range(n)]
+
+def random_graph_data(n, rng, degree=4):
+    """Connected directed graph in the network_graph.json format: a ring plus
+    ``degree - 1`` random extra edges per node"""
+    nodes = [{'id': i, 'label': f"Node {i}", 'group': 'network'} for i in range(n)]
+    edges = {}
+    for i in range(n):
+        edges[(i, (i + 1) % n)] = rng.randint(1, 100)
+        for _ in range(degree - 1):
+            j = rng.randrange(n)
+            if j != i:
+                edges[(i, j)] = rng.randint(1, 100)
+    return {
+        'nodes': nodes,
+        'edges': [{'from': u, 'to': v, 'weight': w, 'label': f"{w}ms"} for (u, v), w in edges.items()]
+    }
+
+def random_tree(n, rng):
+    """Alert-tree shaped dict with every node attached to a random earlier one"""
+    nodes = [{'node': f"alert {i}", 'children': []} for i in range(n)]
+    for i in range(1, n):
+        nodes[rng.randrange(i)]['children'].append(nodes[i])
+    root = nodes[0]
+    return {'root': root.pop('node'), 'children': root['children']}
+
+def complete_graph(n, rng):
+    G = nx.Graph()
+    for u in range(n):
+        for v in range(u + 1, n):
+            G.add_edge(u, v, weight=rng.randint(1, 100))
+    return G
+
+class Benchmark:
+    """One algorithm under test.
+
+    ``setup(n, rng)`` builds the input for size ``n``; ``run(state)`` is the
+    timed call. When ``fresh`` is given, every call gets ``fresh(state)``
+    (e.g. a copy of the list an in-place sort mutates), prepared before the
+    clock starts. ``processes`` marks benchmarks that start a worker pool;
+    the web route leaves those to the command line.
+    """
+
+    def __init__(self, name, description, setup, run, fresh=None, max_size=None, sizes=None, processes=False):
+        self.name = name
+        self.description = description
+        self.setup = setup
+        self.run = run
+        self.fresh = fresh
+        self.max_size = max_size
+        self.sizes = sizes
+        self.processes = processes
+
+def _search_setup(n, rng):
+    words = sorted(random_words(n, rng))
+    return words, [rng.choice(words) for _ in range(64)]
+
+def _graph_setup(n, rng):
+    return csr_graph.build_csr_graph(random_graph_data(n, rng))
+
+def _networkx_setup(n, rng):
+    G = nx.DiGraph()
+    for edge in random_graph_data(n, rng)['edges']:
+        G.add_edge(edge['from'], edge['to'], weight=edge['weight'])
+    return G
+
+def _negative_cycle_setup(n, rng):
+    """Random graph with a negative cycle reachable from node 0"""
+    G = _networkx_setup(n, rng)
+    G.add_edge(1, 0, weight=-1000)
+    return G
+
+def _held_karp_setup(n, rng):
+    G = complete_graph(n, rng)
+    return G, list(range(n)), all_pairs_shortest_paths(G)
+
+BENCHMARKS = {benchmark.name: benchmark for benchmark in [
+    Benchmark('binary_search', '64 successful lookups in a sorted wordlist',
+              _search_setup,
+              lambda state: [binary_search(state[0], target, StepTracer('off')) for target in state[1]]),
+    Benchmark('linear_search', '64 successful scans of a sorted wordlist',
+              _search_setup,
+              lambda state: [linear_search(state[0], target, StepTracer('off')) for target in state[1]],
+              max_size=16384),
+    Benchmark('merge_sort', 'merge_sort over log records',
+              random_log_records,
+              lambda arr: merge_sort(arr, tracer=StepTracer('off')),
+              fresh=list.copy),
+    Benchmark('bottom_up_merge_sort', 'iterative buffer-reusing merge sort over log records',
+              random_log_records,
+              lambda arr: bottom_up_merge_sort(arr, itemgetter(0))),
+    Benchmark('parallel_merge_sort', 'merge sort partitioned over a process pool, k-way merged',
+              random_log_records,
+              lambda arr: parallel_merge_sort(arr, itemgetter(0), min_size=0),
+              max_size=1 << 20, processes=True),
+    Benchmark('quick_sort', 'quick_sort over (response_time, log) records',
+              lambda n, rng: [(rng.randint(50, 2500), f"entry {i}") for i in range(n)],
+              lambda arr: quick_sort(arr, tracer=StepTracer('off')),
+              fresh=list.copy),
+    Benchmark('introsort', 'in-place iterative introsort over (response_time, log) records',
+              lambda n, rng: [(rng.randint(50, 2500), f"entry {i}") for i in range(n)],
+              lambda arr: introsort(arr, tracer=StepTracer('off')),
+              fresh=list.copy),
+    Benchmark('tree_traversal', 'preorder traversal of a random alert tree',
+              random_tree,
+              lambda tree: traverse_tree(tree, 'preorder'),
+              max_size=4096),
+    Benchmark('bfs_networkx', 'BFS path search on a networkx graph',
+              _networkx_setup,
+              lambda G: bfs_path(G, 0, len(G) - 1),
+              max_size=16384),
+    Benchmark('bfs_csr', 'BFS path search on the CSR graph',
+              _graph_setup,
+              lambda G: csr_graph.bfs_path(G, G.nodes()[0], G.nodes()[-1])),
+    Benchmark('dfs_csr', 'DFS path search on the CSR graph',
+              _graph_setup,
+              lambda G: csr_graph.dfs_path(G, G.nodes()[0], G.nodes()[-1])),
+    Benchmark('dijkstra', 'single-source Dijkstra on a networkx graph',
+              _networkx_setup,
+              lambda G: dijkstra_distances(G, 0)),
+    Benchmark('dijkstra_csr', 'single-source Dijkstra on the CSR graph',
+              _graph_setup,
+              lambda G: csr_graph.dijkstra_distances(G, G.nodes()[0])),
+    Benchmark('bellman_ford_classic', 'classic Bellman-Ford',
+              _networkx_setup,
+              lambda G: run_bellman_ford(G, 0, 'classic'),
+              max_size=512),
+    Benchmark('bellman_ford_vectorized', 'NumPy Bellman-Ford',
+              _networkx_setup,
+              lambda G: run_bellman_ford(G, 0, 'vectorized')),
+    Benchmark('bellman_ford_spfa', 'SPFA Bellman-Ford',
+              _networkx_setup,
+              lambda G: run_bellman_ford(G, 0, 'spfa')),
+    Benchmark('bellman_ford_spfa_cycle', 'SPFA Bellman-Ford stopping on a negative cycle',
+              _negative_cycle_setup,
+              lambda G: run_bellman_ford(G, 0, 'spfa')),
+    Benchmark('floyd_warshall', 'vectorized all-pairs shortest paths',
+              _networkx_setup,
+              all_pairs_shortest_paths,
+              max_size=512),
+    Benchmark('held_karp', 'exact TSP over a complete graph',
+              _held_karp_setup,
+              lambda state: held_karp_tsp(*state),
+              sizes=[4, 6, 8, 10, 12, 14]),
+]}
+
+def _time_calls(benchmark, state, number):
+    inputs = [benchmark.fresh(state) for _ in range(number)] if benchmark.fresh else None
+    run = benchmark.run
+    start = time.perf_counter_ns()
+    if inputs is None:
+        for _ in range(number):
+            run(state)
+    else:
+        for value in inputs:
+            run(value)
+    return time.perf_counter_ns() - start
+
+def _calibrate(benchmark, state, min_time_ns):
+    """Calls per sample so each sample lasts at least ``min_time_ns``"""
+    number = 1
+    while True:
+        elapsed = _time_calls(benchmark, state, number)
+        if elapsed >= min_time_ns or number >= 1 << 20:
+            return number
+        number *= 2 if elapsed == 0 else max(2, min(10, math.ceil(min_time_ns / elapsed)))
+
+def summarize(samples):
+    """Median and interquartile range of per-call times (ns)"""
+    q1, median, q3 = np.percentile(samples, [25, 50, 75])
+    return {
+        'median_ns': float(median),
+        'q1_ns': float(q1),
+        'q3_ns': float(q3),
+        'iqr_ns': float(q3 - q1),
+        'min_ns': float(min(samples)),
+        'max_ns': float(max(samples)),
+    }
+
+def measure(benchmark, n, seed=0, repeats=7, warmup=1, min_time_ns=2_000_000):
+    """Time ``benchmark`` at size ``n``: warmup runs, then ``repeats`` samples"""
+    state = benchmark.setup(n, random.Random(f"{seed}:{benchmark.name}:{n}"))
+    for _ in range(warmup):
+        _time_calls(benchmark, state, 1)
+
+    number = _calibrate(benchmark, state, min_time_ns)
+    samples = [_time_calls(benchmark, state, number) / number for _ in range(repeats)]
+    return {'n': n, 'number': number, 'repeats': repeats, **summarize(samples)}
+
+def fit_complexity(sizes, times):
+    """Best matching complexity class for median times over sizes.
+
+    Each model ``t = c * f(n)`` is fitted by least squares on relative error;
+    the log-log slope is reported alongside as an empirical exponent.
+    """
+    if len(sizes) < 3:
+        return None
+    n = np.asarray(sizes, dtype=float)
+    t = np.asarray(times, dtype=float)
+
+    residuals = {}
+    for name, model in COMPLEXITY_MODELS.items():
+        with np.errstate(over='ignore'):
+            f = model(n).astype(float)
+        if not np.all(np.isfinite(f)) or np.any(f <= 0):
+            continue
+        ratio = f / t
+        c = ratio.sum() / (ratio ** 2).sum()
+        residuals[name] = float(np.sqrt(np.mean((c * ratio - 1) ** 2)))
+
+    exponent = float(np.polyfit(np.log(n), np.log(t), 1)[0])
+    return {
+        'best': min(residuals, key=residuals.get),
+        'exponent': round(exponent, 3),
+        'residuals': {name: round(residual, 4) for name, residual in residuals.items()}
+    }
+
+def run_benchmarks(names=None, min_size=16, max_size=4096, factor=2, repeats=7, warmup=1, seed=0,
+                   min_time_ns=2_000_000):
+    """Run the named benchmarks (all by default) and return the JSON report"""
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks {unknown}. Available benchmarks: {list(BENCHMARKS)}")
+    if min_size > max_size:
+        raise ValueError(f"min_size {min_size} is larger than max_size {max_size}")
+    if repeats < 1:
+        raise ValueError('repeats must be at least 1')
+
+    report = {
+        'meta': {
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'seed': seed,
+            'repeats': repeats,
+            'warmup': warmup,
+            'clock': 'perf_counter_ns'
+        },
+        'benchmarks': {}
+    }
+
+    for name in names:
+        benchmark = BENCHMARKS[name]
+        if benchmark.sizes is not None:
+            sizes = [n for n in benchmark.sizes if n <= max_size]
+        else:
+            upper = min(max_size, benchmark.max_size or max_size)
+            sizes = geometric_sizes(max(min_size, 2), upper, factor)
+
+        results = [measure(benchmark, n, seed, repeats, warmup, min_time_ns) for n in sizes]
+        report['benchmarks'][name] = {
+            'description': benchmark.description,
+            'results': results,
+            'fit': fit_complexity([r['n'] for r in results], [r['median_ns'] for r in results])
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m algorithms.benchmark', description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', help='benchmarks to run (default: all)')
+    parser.add_argument('--list', action='store_true', help='list the available benchmarks and exit')
+    parser.add_argument('--min-size', type=int, default=16)
+    parser.add_argument('--max-size', type=int, default=4096)
+    parser.add_argument('--factor', type=float, default=2)
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-time-ms', type=float, default=2, help='minimum duration of one sample')
+    parser.add_argument('-o', '--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for benchmark in BENCHMARKS.values():
+            print(f"{benchmark.name:26} {benchmark.description}")
+        return 0
+
+    try:
+        report = run_benchmarks(args.names, args.min_size, args.max_size, args.factor, args.repeats, args.warmup,
+                                args.seed, int(args.min_time_ms * 1e6))
+    except ValueError as e:
+        parser.error(str(e))
+
+    for name, result in report['benchmarks'].items():
+        if not result['results']:
+            # No size of this benchmark falls in the requested range
+            print(f"{name:26} no sizes in range", file=sys.stderr)
+            continue
+        fit = result['fit']
+        largest = result['results'][-1]
+        summary = f"{fit['best']} (exponent {fit['exponent']})" if fit else 'too few sizes to fit'
+        print(f"{name:26} n={largest['n']:<8} median {largest['median_ns'] / 1e6:10.3f} ms  {summary}",
+              file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(text)
+    else:
+        print(text)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import networkx as nx
 from io import BytesIO
 import base64
+from algorithms import csr_graph
+from algorithms.drawing import graph_drawing, path_edges
 
 def load_network_graph(filename):
     with open(filename, 'r') as file:
@@ -55,20 +57,27 @@ def dfs_path(graph, start, end, path=None, visited=None):
     
     return None
 
-def detect_phishing_route(graph, start_node, end_node):
-    G = build_graph(graph)
+def detect_phishing_route(graph, start_node, end_node, G=None):
+    if G is None:
+        G = build_graph(graph)
     
-    bfs_result = bfs_path(G, start_node, end_node)
-    dfs_result = dfs_path(G, start_node, end_node)
+    if isinstance(G, csr_graph.CSRGraph):
+        bfs_result = csr_graph.bfs_path(G, start_node, end_node)
+        dfs_result = csr_graph.dfs_path(G, start_node, end_node)
+    else:
+        bfs_result = bfs_path(G, start_node, end_node)
+        dfs_result = dfs_path(G, start_node, end_node)
     
     return {
         'bfs_path': bfs_result,
         'dfs_path': dfs_result
     }
 
-def visualize_graph_paths(graph_data, paths):
-    G = build_graph(graph_data)
-    pos = nx.spring_layout(G, seed=42)
+def visualize_graph_paths(graph_data, paths, G=None, pos=None):
+    if G is None:
+        G = build_graph(graph_data)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42)
     
     plt.figure(figsize=(12, 8))
     
@@ -112,4 +121,14 @@ def visualize_graph_paths(graph_data, paths):
     plt.savefig(img, format='png')
     img.seek(0)
     plt.close()
-    return base64.b64encode(img.getvalue()).decode('utf-8')
\ No newline at end of file
+    return base64.b64encode(img.getvalue()).decode('utf-8')
+
+def graph_paths_drawing(graph_data, paths, G=None, pos=None):
+    """Client-side counterpart of visualize_graph_paths"""
+    if G is None:
+        G = build_graph(graph_data)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42)
+    
+    return graph_drawing(G, pos, [{'name': name, 'label': name, 'edges': path_edges(path)}
+                                  for name, path in paths.items()])
@@ -2,42 +2,50 @@ import time
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
+from algorithms import render_service
+from algorithms.password_index import PasswordIndex
+from algorithms.step_trace import StepTracer, make_tracer
 
 def load_passwords(filename):
     with open(filename, 'r') as file:
         return [line.strip() for line in file]
 
-def binary_search(arr, target):
-    steps = []
+def binary_search(arr, target, tracer=None):
+    if isinstance(arr, PasswordIndex):
+        return arr.binary_search(target, tracer)
+    
+    tracer = make_tracer(tracer)
     left, right = 0, len(arr) - 1
     while left <= right:
         mid = (left + right) // 2
-        steps.append({
-            'left': left,
-            'right': right,
-            'mid': mid,
-            'current': arr[mid],
-            'target': target
-        })
+        if tracer.step('probe'):
+            tracer.record({
+                'left': left,
+                'right': right,
+                'mid': mid,
+                'current': arr[mid],
+                'target': target
+            })
         if arr[mid] == target:
-            return True, steps
+            return True, tracer.steps
         elif arr[mid] < target:
             left = mid + 1
         else:
             right = mid - 1
-    return False, steps
+    return False, tracer.steps
 
-def linear_search(arr, target):
-    steps = []
+def linear_search(arr, target, tracer=None):
+    tracer = make_tracer(tracer)
     for i, item in enumerate(arr):
-        steps.append({
-            'position': i,
-            'current': item,
-            'target': target
-        })
+        if tracer.step('probe'):
+            tracer.record({
+                'position': i,
+                'current': item,
+                'target': target
+            })
         if item == target:
-            return True, steps
-    return False, steps
+            return True, tracer.steps
+    return False, tracer.steps
 
 def visualize_search(steps, algorithm_name):
     positions = [step['mid'] if 'mid' in step else step['position'] for step in steps]
@@ -64,29 +72,64 @@ def visualize_search(steps, algorithm_name):
     plt.close()
     return base64.b64encode(img.getvalue()).decode('utf-8')
 
-def compare_search_algorithms(sorted_passwords, target):
-    start_time = time.time()
-    binary_found, binary_steps = binary_search(sorted_passwords, target)
-    binary_time = time.time() - start_time
+def compare_search_algorithms(sorted_passwords, target, render=None, trace='full', trace_every=10):
+    render = render_service.resolve(render)
+    
+    # Timed with tracing off so the numbers measure the searches themselves
+    start_time = time.perf_counter()
+    binary_found, _ = binary_search(sorted_passwords, target, StepTracer('off'))
+    binary_time = time.perf_counter() - start_time
     
-    start_time = time.time()
-    linear_found, linear_steps = linear_search(sorted_passwords, target)
-    linear_time = time.time() - start_time
+    start_time = time.perf_counter()
+    linear_found, _ = linear_search(sorted_passwords, target, StepTracer('off'))
+    linear_time = time.perf_counter() - start_time
     
-    binary_img = visualize_search(binary_steps, 'Binary')
-    linear_img = visualize_search(linear_steps, 'Linear')
+    # Separate untimed runs record the trace at the requested level
+    binary_trace = StepTracer(trace, trace_every)
+    linear_trace = StepTracer(trace, trace_every)
+    if binary_trace.enabled:
+        binary_search(sorted_passwords, target, binary_trace)
+        linear_search(sorted_passwords, target, linear_trace)
+    
+    # Both figures render concurrently
+    binary_img = (render(visualize_search, binary_trace.steps, 'Binary') if binary_trace.steps
+                  else render_service.skip(visualize_search))
+    linear_img = (render(visualize_search, linear_trace.steps, 'Linear') if linear_trace.steps
+                  else render_service.skip(visualize_search))
     
     return {
         'binary': {
             'found': binary_found,
-            'steps': len(binary_steps),
+            'steps': binary_trace.count if binary_trace.enabled else None,
             'time': binary_time,
-            'image': binary_img
+            'trace': binary_trace.summary(),
+            'image': binary_img.result()
         },
         'linear': {
             'found': linear_found,
-            'steps': len(linear_steps),
+            'steps': linear_trace.count if linear_trace.enabled else None,
             'time': linear_time,
-            'image': linear_img
+            'trace': linear_trace.summary(),
+            'image': linear_img.result()
         }
-    }
\ No newline at end of file
+    }
+
+def check_candidates(index, candidates):
+    """Resolve a whole list of candidates against a PasswordIndex at once"""
+    start_time = time.perf_counter()
+    found, comparisons = index.batch_contains(candidates)
+    duration = time.perf_counter() - start_time
+    
+    # What one binary search per candidate would cost in the worst case
+    binary_bound = len(candidates) * max(1, len(index)).bit_length()
+    
+    return {
+        'status': 'success',
+        'total': len(candidates),
+        'found_count': sum(found),
+        'found': [candidate for candidate, hit in zip(candidates, found) if hit],
+        'not_found': [candidate for candidate, hit in zip(candidates, found) if not hit],
+        'comparisons': comparisons,
+        'binary_search_bound': binary_bound,
+        'time': duration
+    }
@@ -0,0 +1,239 @@
+import heapq
+from array import array
+from collections import deque
+import numpy as np
+
+class CSRGraph:
+    """Compressed sparse row adjacency built from the network graph JSON.
+
+    Node ids are remapped to ``0..n-1`` (``node_ids`` maps back, ``index``
+    maps forward). The out-edges of node ``i`` are
+    ``targets[offsets[i]:offsets[i + 1]]`` with matching ``weights``, kept in
+    the order they appear in the JSON so traversals visit neighbours in the
+    same order as the networkx version.
+    """
+
+    def __init__(self, node_ids, offsets, targets, weights):
+        self.node_ids = node_ids
+        self.index = {node: i for i, node in enumerate(node_ids)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def nodes(self):
+        return list(self.node_ids)
+
+    def edges(self):
+        """Yield ``(from_id, to_id, weight)`` in CSR order"""
+        node_ids, offsets, targets, weights = self.node_ids, self.offsets, self.targets, self.weights
+        for u in range(len(node_ids)):
+            for i in range(offsets[u], offsets[u + 1]):
+                yield node_ids[u], node_ids[targets[i]], weights[i]
+
+    def edge_arrays(self):
+        """Zero-copy NumPy views ``(sources, targets, weights)`` over all edges"""
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        sources = np.repeat(np.arange(len(self.node_ids), dtype=np.int32), np.diff(offsets))
+        return (sources,
+                np.frombuffer(self.targets, dtype=np.int32),
+                np.frombuffer(self.weights, dtype=np.float64))
+
+    def with_unit_weights(self):
+        """Same topology with every edge weight set to 1 (hop counts)"""
+        return CSRGraph(self.node_ids, self.offsets, self.targets,
+                        array('d', [1.0]) * len(self.targets))
+
+def build_csr_graph(data):
+    """Build a CSRGraph from ``{'nodes': [...], 'edges': [...]}``"""
+    if not data or 'nodes' not in data or 'edges' not in data:
+        raise ValueError("Invalid graph data structure")
+
+    node_ids = [node['id'] for node in data['nodes']]
+    index = {node: i for i, node in enumerate(node_ids)}
+
+    # Like networkx, edges may introduce nodes that were not listed
+    for edge in data['edges']:
+        for end in (edge['from'], edge['to']):
+            if end not in index:
+                index[end] = len(node_ids)
+                node_ids.append(end)
+
+    edges = data['edges']
+    sources = np.fromiter((index[e['from']] for e in edges), dtype=np.int32, count=len(edges))
+    targets = np.fromiter((index[e['to']] for e in edges), dtype=np.int32, count=len(edges))
+    weights = np.fromiter((float(e['weight']) for e in edges), dtype=np.float64, count=len(edges))
+
+    order = np.argsort(sources, kind='stable')
+    offsets = np.zeros(len(node_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=len(node_ids)), out=offsets[1:])
+
+    return CSRGraph(node_ids,
+                    array('q', offsets.tobytes()),
+                    array('i', targets[order].tobytes()),
+                    array('d', weights[order].tobytes()))
+
+def _walk_back(graph, parent, end):
+    path = []
+    node = end
+    while node != -1:
+        path.append(graph.node_ids[node])
+        node = parent[node]
+    path.reverse()
+    return path
+
+def bfs_path(graph, start, end):
+    """Fewest-hop path as a list of node ids, or None"""
+    if start not in graph or end not in graph:
+        return None
+
+    s, t = graph.index[start], graph.index[end]
+    offsets, targets = graph.offsets, graph.targets
+    parent = array('q', [-1]) * len(graph)
+    visited = bytearray(len(graph))
+    visited[s] = 1
+    queue = deque([s])
+
+    while queue:
+        u = queue.popleft()
+        if u == t:
+            return _walk_back(graph, parent, t)
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if not visited[v]:
+                visited[v] = 1
+                parent[v] = u
+                queue.append(v)
+
+    return None
+
+def dfs_path(graph, start, end):
+    """First path found by depth-first search, or None"""
+    if start not in graph or end not in graph:
+        return None
+
+    s, t = graph.index[start], graph.index[end]
+    if s == t:
+        return [start]
+
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(len(graph))
+    visited[s] = 1
+    # Explicit stack instead of recursion: one edge cursor per open node
+    stack = [s]
+    cursors = [offsets[s]]
+
+    while stack:
+        u = stack[-1]
+        i = cursors[-1]
+        if i == offsets[u + 1]:
+            stack.pop()
+            cursors.pop()
+            continue
+
+        cursors[-1] = i + 1
+        v = targets[i]
+        if visited[v]:
+            continue
+        visited[v] = 1
+        if v == t:
+            return [graph.node_ids[x] for x in stack] + [end]
+        stack.append(v)
+        cursors.append(offsets[v])
+
+    return None
+
+def _dijkstra(graph, s, stop=None):
+    """Settle nodes from index ``s`` until the ``stop`` index set is empty.
+
+    Returns the best-distance and parent arrays plus the settled flags.
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = array('d', [float('inf')]) * len(graph)
+    parent = array('q', [-1]) * len(graph)
+    settled = bytearray(len(graph))
+    dist[s] = 0.0
+    queue = [(0.0, s)]
+
+    while queue:
+        d, u = heapq.heappop(queue)
+        if settled[u]:
+            continue  # stale entry
+        settled[u] = 1
+        if stop is not None:
+            stop.discard(u)
+            if not stop:
+                break
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            nd = d + weights[i]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                heapq.heappush(queue, (nd, v))
+
+    return dist, parent, settled
+
+def dijkstra_distances(graph, source, targets=None):
+    """Same contract as ``dijkstra.dijkstra_distances``: (distances, predecessors)"""
+    stop = {graph.index[t] for t in targets if t in graph} if targets is not None else None
+    dist, parent, settled = _dijkstra(graph, graph.index[source], stop)
+
+    node_ids = graph.node_ids
+    distances = {node_ids[i]: dist[i] for i in range(len(graph)) if settled[i]}
+    predecessors = {node_ids[i]: (node_ids[parent[i]] if parent[i] != -1 else None)
+                    for i in range(len(graph)) if dist[i] != float('inf')}
+    return distances, predecessors
+
+def dijkstra_shortest_path(graph, start, end):
+    """Shortest weighted path, returns (path, distance) or (None, inf)"""
+    if start not in graph or end not in graph:
+        return None, float('inf')
+
+    t = graph.index[end]
+    dist, parent, settled = _dijkstra(graph, graph.index[start], {t})
+    if not settled[t]:
+        return None, float('inf')
+    return _walk_back(graph, parent, t), dist[t]
+
+def bellman_ford_detection(graph, start_node):
+    """Bellman-Ford over the edge arrays, returns (distances, negative_edges)"""
+    if start_node not in graph:
+        raise ValueError(f"Start node {start_node} not in graph")
+
+    n = len(graph)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [float('inf')] * n
+    dist[graph.index[start_node]] = 0
+
+    for _ in range(n - 1):
+        changed = False
+        for u in range(n):
+            du = dist[u]
+            if du == float('inf'):
+                continue
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if du + weights[i] < dist[v]:
+                    dist[v] = du + weights[i]
+                    changed = True
+        if not changed:
+            break
+
+    negative_edges = []
+    for u in range(n):
+        for i in range(offsets[u], offsets[u + 1]):
+            if dist[u] + weights[i] < dist[targets[i]]:
+                negative_edges.append((graph.node_ids[u], graph.node_ids[targets[i]]))
+
+    distances = {node: dist[i] for i, node in enumerate(graph.node_ids)}
+    return distances, negative_edges
@@ -4,6 +4,8 @@ import networkx as nx
 from io import BytesIO
 import base64
 import heapq
+from algorithms import csr_graph
+from algorithms.drawing import graph_drawing, path_edges
 
 def load_network_graph(filename):
     with open(filename, 'r') as file:
@@ -20,41 +22,80 @@ def build_graph(data):
     
     return G
 
-def dijkstra_shortest_path(graph, start, end):
-    # Priority queue: (distance, node, path)
-    queue = [(0, start, [start])]
-    visited = set()
+def dijkstra_distances(graph, source, targets=None):
+    """Single-source Dijkstra keeping a best-distance table and predecessor map.
+
+    Returns (distances, predecessors) for the settled nodes. When ``targets``
+    is given the search stops as soon as all of them are settled.
+    """
+    best = {source: 0}
+    predecessors = {source: None}
+    distances = {}
+    remaining = set(targets) if targets is not None else None
+    
+    # Priority queue: (distance, tie-breaker, node)
+    counter = 0
+    queue = [(0, counter, source)]
     
     while queue:
-        distance, node, path = heapq.heappop(queue)
+        distance, _, node = heapq.heappop(queue)
+        
+        if node in distances:
+            continue  # stale entry, node already settled with a shorter distance
+        distances[node] = distance
         
-        if node == end:
-            return path, distance
+        if remaining is not None:
+            remaining.discard(node)
+            if not remaining:
+                break
         
-        if node not in visited:
-            visited.add(node)
-            
-            for neighbor in graph.neighbors(node):
-                edge_weight = graph.get_edge_data(node, neighbor)['weight']
-                new_distance = distance + edge_weight
-                new_path = path + [neighbor]
-                heapq.heappush(queue, (new_distance, neighbor, new_path))
-    
-    return None, float('inf')
+        adjacency = graph[node]
+        for neighbor in adjacency:
+            new_distance = distance + adjacency[neighbor]['weight']
+            if new_distance < best.get(neighbor, float('inf')):
+                best[neighbor] = new_distance
+                predecessors[neighbor] = node
+                counter += 1
+                heapq.heappush(queue, (new_distance, counter, neighbor))
+    
+    return distances, predecessors
 
-def find_secure_paths(graph_data, start_node, end_node):
-    G = build_graph(graph_data)
-    
-    # Find shortest path based on weights (latency)
-    shortest_path, shortest_distance = dijkstra_shortest_path(G, start_node, end_node)
+def reconstruct_path(predecessors, end):
+    path = []
+    node = end
+    while node is not None:
+        path.append(node)
+        node = predecessors[node]
+    path.reverse()
+    return path
+
+def dijkstra_shortest_path(graph, start, end):
+    distances, predecessors = dijkstra_distances(graph, start, targets=[end])
     
-    # Find safest path (least hops)
-    # To do this, we set all weights to 1 and run Dijkstra's
-    H = G.copy()
-    for u, v in H.edges():
-        H.edges[u, v]['weight'] = 1
+    if end not in distances:
+        return None, float('inf')
     
-    safest_path, safest_hops = dijkstra_shortest_path(H, start_node, end_node)
+    return reconstruct_path(predecessors, end), distances[end]
+
+def find_secure_paths(graph_data, start_node, end_node, G=None):
+    if G is None:
+        G = build_graph(graph_data)
+    
+    if isinstance(G, csr_graph.CSRGraph):
+        shortest_path, shortest_distance = csr_graph.dijkstra_shortest_path(G, start_node, end_node)
+        safest_path, safest_hops = csr_graph.dijkstra_shortest_path(
+            G.with_unit_weights(), start_node, end_node)
+    else:
+        # Find shortest path based on weights (latency)
+        shortest_path, shortest_distance = dijkstra_shortest_path(G, start_node, end_node)
+        
+        # Find safest path (least hops)
+        # To do this, we set all weights to 1 and run Dijkstra's
+        H = G.copy()
+        for u, v in H.edges():
+            H.edges[u, v]['weight'] = 1
+        
+        safest_path, safest_hops = dijkstra_shortest_path(H, start_node, end_node)
     
     return {
         'shortest_path': {
@@ -67,9 +108,59 @@ def find_secure_paths(graph_data, start_node, end_node):
         }
     }
 
-def visualize_secure_paths(graph_data, paths):
-    G = build_graph(graph_data)
-    pos = nx.spring_layout(G, seed=42)
+def _distances_from(G, source, targets=None):
+    if isinstance(G, csr_graph.CSRGraph):
+        return csr_graph.dijkstra_distances(G, source, targets)
+    return dijkstra_distances(G, source, targets)
+
+def one_to_all_distances(graph_data, source, G=None):
+    """Latency and route from ``source`` to every node in the graph.
+    
+    Unreachable nodes get a distance of None (``float('inf')`` is not valid
+    JSON) and no path.
+    """
+    if G is None:
+        G = build_graph(graph_data)
+    
+    if source not in G:
+        return {'status': 'error', 'message': f"Source node {source} not found"}
+    
+    distances, predecessors = _distances_from(G, source)
+    
+    return {
+        'status': 'success',
+        'source': source,
+        'distances': {node: distances.get(node) for node in G.nodes()},
+        'paths': {node: reconstruct_path(predecessors, node) for node in distances}
+    }
+
+def distance_matrix(graph_data, sources, targets, G=None):
+    """Many-to-many latency matrix, one early-exit Dijkstra per source.
+    Unreachable pairs are None."""
+    if G is None:
+        G = build_graph(graph_data)
+    
+    missing = [node for node in list(sources) + list(targets) if node not in G]
+    if missing:
+        return {'status': 'error', 'message': f"Nodes not found: {missing}"}
+    
+    matrix = []
+    for source in sources:
+        distances, _ = _distances_from(G, source, targets)
+        matrix.append([distances.get(target) for target in targets])
+    
+    return {
+        'status': 'success',
+        'sources': list(sources),
+        'targets': list(targets),
+        'matrix': matrix
+    }
+
+def visualize_secure_paths(graph_data, paths, G=None, pos=None):
+    if G is None:
+        G = build_graph(graph_data)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42)
     
     plt.figure(figsize=(12, 8))
     
@@ -115,4 +206,18 @@ def visualize_secure_paths(graph_data, paths):
     plt.savefig(img, format='png')
     img.seek(0)
     plt.close()
-    return base64.b64encode(img.getvalue()).decode('utf-8')
\ No newline at end of file
+    return base64.b64encode(img.getvalue()).decode('utf-8')
+
+def secure_paths_drawing(graph_data, paths, G=None, pos=None):
+    """Client-side counterpart of visualize_secure_paths"""
+    if G is None:
+        G = build_graph(graph_data)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42)
+    
+    return graph_drawing(G, pos, [
+        {'name': 'shortest', 'label': f"Shortest (Latency: {paths['shortest_path']['total_latency']}ms)",
+         'edges': path_edges(paths['shortest_path']['path'])},
+        {'name': 'safest', 'label': f"Safest (Hops: {paths['safest_path']['total_hops']})",
+         'edges': path_edges(paths['safest_path']['path'])}
+    ])
@@ -0,0 +1,35 @@
+def path_edges(path):
+    """Consecutive node pairs of a path as [u, v] lists"""
+    if not path:
+        return []
+    return [[u, v] for u, v in zip(path[:-1], path[1:])]
+
+def graph_drawing(G, pos, highlights=(), node_labels=None):
+    """Everything a client needs to draw ``G`` itself instead of a PNG.
+
+    Nodes carry their cached layout coordinates, edges their weight and
+    label, and every highlight is ``{'name', 'label', 'edges'}`` in the order
+    the matplotlib figure would draw it. ``node_labels`` optionally overrides
+    the text shown for some nodes.
+    """
+    node_labels = node_labels or {}
+    nodes = []
+    for node, attrs in G.nodes(data=True):
+        x, y = pos[node]
+        nodes.append({
+            'id': node,
+            'label': node_labels.get(node, attrs.get('label', str(node))),
+            'group': attrs.get('group'),
+            'x': round(float(x), 4),
+            'y': round(float(y), 4)
+        })
+
+    edges = [{'from': u, 'to': v, 'weight': attrs.get('weight'), 'label': attrs.get('label')}
+             for u, v, attrs in G.edges(data=True)]
+
+    return {
+        'directed': G.is_directed(),
+        'nodes': nodes,
+        'edges': edges,
+        'highlights': [highlight for highlight in highlights if highlight['edges']]
+    }
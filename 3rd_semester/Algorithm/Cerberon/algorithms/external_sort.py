@@ -0,0 +1,143 @@
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+import time
+from algorithms.log_parser import SEVERITY_ORDER, parse_log, parse_stats
+
+# Run file record: time_seconds, severity code, length of the UTF-8 line, then the line
+RECORD_HEADER = struct.Struct('<iBI')
+
+SORT_KEYS = {
+    'time': lambda record: record[0],
+    'severity': lambda record: (record[1], record[0]),
+}
+
+def write_run(records, filename):
+    """Write (time_seconds, severity_code, line) records in the binary run format"""
+    pack = RECORD_HEADER.pack
+    with open(filename, 'wb', buffering=1 << 20) as file:
+        for time_seconds, severity, line in records:
+            data = line.encode('utf-8')
+            file.write(pack(time_seconds, severity, len(data)))
+            file.write(data)
+
+def read_run(filename):
+    """Stream the records of a run file back"""
+    size = RECORD_HEADER.size
+    unpack = RECORD_HEADER.unpack
+    with open(filename, 'rb', buffering=1 << 20) as file:
+        while True:
+            header = file.read(size)
+            if not header:
+                return
+            time_seconds, severity, length = unpack(header)
+            yield time_seconds, severity, file.read(length).decode('utf-8')
+
+def spill_runs(records, keys, folder, chunk_size=100_000):
+    """Sort ``records`` in chunks of ``chunk_size`` and spill one run per
+    chunk and key. Returns ``{key: [run files]}``."""
+    runs = {key: [] for key in keys}
+
+    def spill(chunk):
+        for key in keys:
+            filename = os.path.join(folder, f"{key}-{len(runs[key]):06d}.run")
+            write_run(sorted(chunk, key=SORT_KEYS[key]), filename)
+            runs[key].append(filename)
+
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            spill(chunk)
+            chunk = []
+    if chunk or not any(runs.values()):
+        spill(chunk)
+    return runs
+
+def merge_runs(runs, key, folder, fan_in=64):
+    """k-way merge of sorted runs, stable across runs.
+
+    More than ``fan_in`` runs are first merged in groups into longer runs so
+    no more than ``fan_in`` files are ever open at once.
+    """
+    sort_key = SORT_KEYS[key]
+    level = 0
+    while len(runs) > fan_in:
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            filename = os.path.join(folder, f"{key}-merge{level}-{i // fan_in:06d}.run")
+            write_run(heapq.merge(*map(read_run, runs[i:i + fan_in]), key=sort_key), filename)
+            merged.append(filename)
+        for filename in runs:
+            os.remove(filename)
+        runs = merged
+        level += 1
+    return heapq.merge(*map(read_run, runs), key=sort_key)
+
+def external_sort(records, key='time', chunk_size=100_000, fan_in=64, temp_folder=None):
+    """Sort an iterable of (time_seconds, severity_code, line) records that
+    may not fit in memory. A generator: the spill files are deleted once it
+    is exhausted or closed."""
+    folder = tempfile.mkdtemp(prefix='cerberon-sort-', dir=temp_folder)
+    try:
+        runs = spill_runs(records, [key], folder, chunk_size)
+        yield from merge_runs(runs[key], key, folder, fan_in)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def write_lines(records, filename, preview=0):
+    """Stream the sorted records to ``filename`` as log lines.
+    Returns the number written and the first ``preview`` lines."""
+    head = []
+    count = 0
+    # A unique temporary per call, concurrent sorts of the same log each replace the output whole
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(filename) or '.', suffix='.tmp')
+    try:
+        with open(fd, 'w', encoding='utf-8', buffering=1 << 20) as file:
+            for _, _, line in records:
+                if count < preview:
+                    head.append(line)
+                file.write(line)
+                file.write('\n')
+                count += 1
+        os.replace(temporary, filename)
+    except BaseException:
+        os.remove(temporary)
+        raise
+    return count, head
+
+def external_sort_logs(log_file, output_folder, chunk_size=100_000, fan_in=64, preview=100, temp_folder=None):
+    """Sort a log by time and by (severity, time) without holding it in memory.
+
+    The log is parsed once; every chunk is sorted both ways and spilled as a
+    binary run, then each ordering is k-way merged straight into
+    ``<output_folder>/<name>.by_time.log`` and ``.by_severity.log``.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    name = os.path.basename(log_file).split('.')[0]
+    parse = parse_stats()
+    records = ((record.time_seconds, SEVERITY_ORDER[record.severity], record.line)
+               for record in parse_log(log_file, stats=parse))
+
+    folder = tempfile.mkdtemp(prefix='cerberon-sort-', dir=temp_folder)
+    try:
+        start_time = time.perf_counter()
+        runs = spill_runs(records, list(SORT_KEYS), folder, chunk_size)
+        spill_duration = time.perf_counter() - start_time
+
+        result = {'parse': parse, 'runs': len(runs['time']), 'spill_duration': spill_duration}
+        for key in SORT_KEYS:
+            start_time = time.perf_counter()
+            output = os.path.join(output_folder, f"{name}.by_{key}.log")
+            count, head = write_lines(merge_runs(runs[key], key, folder, fan_in), output, preview)
+            result[key] = {
+                'output': output,
+                'records': count,
+                'preview': head,
+                'merge_duration': time.perf_counter() - start_time
+            }
+        return result
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
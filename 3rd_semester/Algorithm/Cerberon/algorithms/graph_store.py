@@ -0,0 +1,64 @@
+import json
+import threading
+import networkx as nx
+from algorithms import bfs_dfs, tsp
+from algorithms.apsp import all_pairs_shortest_paths
+from algorithms.csr_graph import build_csr_graph
+from algorithms.versioned_cache import VersionedFileCache
+
+class GraphSnapshot:
+    """One version of the network topology with its derived graphs.
+
+    ``directed`` is used by BFS/DFS, Dijkstra and Bellman-Ford, ``undirected``
+    by the TSP solver. Every graph is built on first use, so a snapshot
+    served only through the CSR engine never holds the networkx graphs. The
+    networkx graphs are frozen so request handlers can share them safely;
+    anything that needs a modified graph must copy it first.
+    """
+
+    def __init__(self, version, data):
+        self.version = version
+        self.data = data
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directed(self):
+        return self.derived('directed', lambda snapshot: nx.freeze(bfs_dfs.build_graph(snapshot.data)))
+
+    @property
+    def undirected(self):
+        return self.derived('undirected', lambda snapshot: nx.freeze(tsp.build_graph(snapshot.data)))
+
+    @property
+    def csr(self):
+        """Array-backed directed graph, built on first use"""
+        return self.derived('csr', lambda snapshot: build_csr_graph(snapshot.data))
+
+    @property
+    def all_pairs(self):
+        """Shortest-path distance/next-hop matrix of the undirected graph"""
+        return self.derived('all_pairs', lambda snapshot: all_pairs_shortest_paths(snapshot.undirected))
+
+    def derived(self, name, builder):
+        """Return ``builder(self)``, computed once for this graph version"""
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = builder(self)
+            return self._derived[name]
+
+def _load_snapshot(filename, version):
+    with open(filename, 'r') as file:
+        data = json.load(file)
+    return GraphSnapshot(version, data)
+
+_snapshots = VersionedFileCache(_load_snapshot)
+
+def get_graph_snapshot(filename):
+    """Process-wide graph for ``filename``, reloaded only when the file changes"""
+    return _snapshots.get(filename)
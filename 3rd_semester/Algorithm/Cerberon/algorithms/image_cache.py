@@ -0,0 +1,177 @@
+import base64
+import hashlib
+import os
+import pickle
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from algorithms import render_service
+
+IMAGE_URL = '/images/{}.png'
+DIGEST_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+class ImageCache:
+    """PNG store addressed by the SHA-256 of the image bytes.
+
+    Images live in a memory LRU and, when ``folder`` is set, on disk as
+    ``<digest>.png``. A second mapping remembers which image a render key
+    (algorithm, inputs, graph version) produced, so repeat queries skip
+    rendering altogether. On disk, the least recently used images and keys
+    beyond ``max_disk_entries`` of each are deleted whenever one is added.
+    """
+
+    def __init__(self, folder=None, max_entries=256, max_disk_entries=4096):
+        self.folder = folder
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._images = OrderedDict()
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, *parts):
+        return os.path.join(self.folder, *parts)
+
+    def get(self, digest):
+        """PNG bytes for ``digest`` or None"""
+        with self._lock:
+            if digest in self._images:
+                self._images.move_to_end(digest)
+                return self._images[digest]
+
+        if self.folder and DIGEST_PATTERN.fullmatch(digest):
+            filename = self._path(f"{digest}.png")
+            try:
+                with open(filename, 'rb') as file:
+                    png = file.read()
+                _touch(filename)
+            except FileNotFoundError:
+                return None
+            self._remember_image(digest, png)
+            return png
+        return None
+
+    def put(self, png):
+        """Store PNG bytes, return their digest"""
+        digest = hashlib.sha256(png).hexdigest()
+        self._remember_image(digest, png)
+
+        if self.folder:
+            filename = self._path(f"{digest}.png")
+            if not os.path.exists(filename):
+                os.makedirs(self.folder, exist_ok=True)
+                temporary = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temporary, 'wb') as file:
+                    file.write(png)
+                os.replace(temporary, filename)
+                self._prune(self.folder, '.png')
+        return digest
+
+    def _prune(self, folder, suffix=''):
+        """Delete the least recently used files of ``folder`` beyond ``max_disk_entries``"""
+        entries = []
+        with os.scandir(folder) as scan:
+            for entry in scan:
+                if entry.is_file() and entry.name.endswith(suffix):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                    except FileNotFoundError:
+                        pass
+        if len(entries) <= self.max_disk_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # pruned by another thread
+
+    def _remember_image(self, digest, png):
+        with self._lock:
+            self._images[digest] = png
+            self._images.move_to_end(digest)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+    def lookup(self, key):
+        """Digest of the image previously rendered for ``key``, if still stored"""
+        with self._lock:
+            digest = self._keys.get(key)
+            if digest is not None:
+                self._keys.move_to_end(key)
+
+        if digest is None and self.folder:
+            filename = self._path('keys', key)
+            try:
+                with open(filename, 'r') as file:
+                    digest = file.read().strip()
+                _touch(filename)
+            except FileNotFoundError:
+                return None
+
+        if digest is None or self.get(digest) is None:
+            return None
+        self.link(key, digest)
+        return digest
+
+    def link(self, key, digest):
+        """Remember that ``key`` renders to ``digest``"""
+        with self._lock:
+            self._keys[key] = digest
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.max_entries * 16:
+                self._keys.popitem(last=False)
+
+        if self.folder:
+            filename = self._path('keys', key)
+            if not os.path.exists(filename):
+                os.makedirs(self._path('keys'), exist_ok=True)
+                with open(filename, 'w') as file:
+                    file.write(digest)
+                self._prune(self._path('keys'))
+
+def _touch(filename):
+    # The modification time doubles as the last use for pruning
+    try:
+        os.utime(filename)
+    except OSError:
+        pass
+
+_cache = ImageCache()
+
+def configure(folder=None, max_entries=256, max_disk_entries=4096):
+    global _cache
+    _cache = ImageCache(folder, max_entries, max_disk_entries)
+
+def get_image(digest):
+    return _cache.get(digest)
+
+def render_key(func, key):
+    """Stable digest naming the figure ``func`` draws for ``key``"""
+    payload = pickle.dumps((func.__module__, func.__qualname__, key), protocol=4)
+    return hashlib.sha256(payload).hexdigest()
+
+def render(func, *args, cache_key=None, **kwargs):
+    """Cached drop-in for ``render_service.submit`` resolving to an image URL.
+
+    ``cache_key`` names the figure (algorithm, inputs, graph version); without
+    one the call arguments themselves are the key.
+    """
+    key = render_key(func, cache_key if cache_key is not None else (args, sorted(kwargs.items())))
+    result = Future()
+
+    digest = _cache.lookup(key)
+    if digest is not None:
+        result.set_result(IMAGE_URL.format(digest))
+        return result
+
+    def store(rendered):
+        try:
+            digest = _cache.put(base64.b64decode(rendered.result()))
+            _cache.link(key, digest)
+            result.set_result(IMAGE_URL.format(digest))
+        except Exception as e:
+            result.set_exception(e)
+
+    render_service.submit(func, *args, **kwargs).add_done_callback(store)
+    return result
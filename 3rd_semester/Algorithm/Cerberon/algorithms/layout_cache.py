@@ -0,0 +1,63 @@
+import json
+import os
+import threading
+import numpy as np
+import networkx as nx
+
+# Every layout is seeded so the same topology always gets the same picture
+LAYOUTS = {
+    'spring': lambda G: nx.spring_layout(G, seed=42),
+    'kamada_kawai': nx.kamada_kawai_layout,
+    'circular': nx.circular_layout,
+}
+
+_layouts = {}
+_lock = threading.Lock()
+
+def _layout_file(folder, key):
+    version, algorithm, directed = key
+    return os.path.join(folder, f"{version}-{algorithm}-{'directed' if directed else 'undirected'}.json")
+
+def _load(filename):
+    try:
+        with open(filename, 'r') as file:
+            return {node: np.array(xy) for node, *xy in json.load(file)}
+    except (FileNotFoundError, json.JSONDecodeError, ValueError):
+        return None
+
+def _save(filename, pos):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    temporary = f"{filename}.{os.getpid()}.tmp"
+    with open(temporary, 'w') as file:
+        # A list of [node, x, y] keeps integer node ids intact
+        json.dump([[node, float(x), float(y)] for node, (x, y) in pos.items()], file)
+    os.replace(temporary, filename)
+
+def get_layout(G, version, algorithm='spring', folder=None):
+    """Node positions for graph version ``version``, computed once.
+
+    Layouts are cached in memory per (version, algorithm, directedness) and,
+    when ``folder`` is given, persisted there so restarts reuse them too.
+    """
+    if algorithm not in LAYOUTS:
+        raise ValueError(f"Unknown layout {algorithm}. Available layouts: {list(LAYOUTS)}")
+
+    key = (version, algorithm, G.is_directed())
+    pos = _layouts.get(key)
+    if pos is not None:
+        return pos
+
+    with _lock:
+        pos = _layouts.get(key)
+        if pos is not None:
+            return pos
+
+        if folder:
+            pos = _load(_layout_file(folder, key))
+        if pos is None or set(pos) != set(G.nodes()):
+            pos = LAYOUTS[algorithm](G)
+            if folder:
+                _save(_layout_file(folder, key), pos)
+
+        _layouts[key] = pos
+        return pos
@@ -0,0 +1,105 @@
+import time
+
+# Ignore "improvements" that are only floating point noise
+EPSILON = 1e-9
+
+def tour_length(cost, order):
+    """Length of the closed tour visiting ``order`` and returning to order[0]"""
+    return sum(cost[order[i - 1]][order[i]] for i in range(len(order)))
+
+def _expired(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+def two_opt_pass(cost, order, deadline=None):
+    """One sweep of first-improvement 2-opt, returns the number of moves.
+
+    Removing edges (a, b) and (c, d) and reconnecting as (a, c), (b, d) is the
+    same as reversing ``order[i + 1:j + 1]``. ``order[0]`` never moves, so
+    the tour keeps its starting node. Assumes symmetric costs.
+    """
+    n = len(order)
+    moves = 0
+    for i in range(n - 2):
+        if _expired(deadline):
+            break
+        for j in range(i + 2, n if i > 0 else n - 1):
+            a, b = order[i], order[i + 1]
+            c, d = order[j], order[(j + 1) % n]
+            delta = cost[a][c] + cost[b][d] - cost[a][b] - cost[c][d]
+            if delta < -EPSILON:
+                order[i + 1:j + 1] = order[i + 1:j + 1][::-1]
+                moves += 1
+    return moves
+
+def _best_or_opt_move(cost, order, start, length):
+    n = len(order)
+    prev, nxt = order[start - 1], order[(start + length) % n]
+    first, last = order[start], order[start + length - 1]
+    removal_gain = cost[prev][first] + cost[last][nxt] - cost[prev][nxt]
+
+    for k in range(n):
+        # The insertion edge must not touch the segment being moved
+        if start - 1 <= k <= start + length - 1:
+            continue
+        p, q = order[k], order[(k + 1) % n]
+        forward = cost[p][first] + cost[last][q] - cost[p][q]
+        backward = cost[p][last] + cost[first][q] - cost[p][q]
+        if forward - removal_gain < -EPSILON:
+            return k, False
+        if backward - removal_gain < -EPSILON:
+            return k, True
+    return None
+
+def or_opt_pass(cost, order, deadline=None, max_segment=3):
+    """Relocate segments of 1..max_segment nodes (optionally reversed) to a
+    cheaper position, returns the number of moves"""
+    n = len(order)
+    moves = 0
+    for length in range(1, max_segment + 1):
+        start = 1
+        while start + length <= n:
+            if _expired(deadline):
+                return moves
+            move = _best_or_opt_move(cost, order, start, length)
+            if move is None:
+                start += 1
+                continue
+
+            k, reverse = move
+            anchor = order[k]
+            segment = order[start:start + length]
+            if reverse:
+                segment.reverse()
+            del order[start:start + length]
+            position = order.index(anchor) + 1
+            order[position:position] = segment
+            moves += 1
+    return moves
+
+def improve_tour(cost, order, max_iterations=100, time_limit=None):
+    """Refine a closed tour with alternating 2-opt and Or-opt sweeps.
+
+    ``cost`` is a square matrix (nested lists or array) indexed by the values
+    in ``order``. Stops when a full iteration makes no move, after
+    ``max_iterations`` iterations or after ``time_limit`` seconds. Returns
+    ``(order, length, stats)``.
+    """
+    if hasattr(cost, 'tolist'):
+        cost = cost.tolist()
+    order = list(order)
+    started = time.perf_counter()
+    deadline = started + time_limit if time_limit is not None else None
+    stats = {'iterations': 0, 'two_opt_moves': 0, 'or_opt_moves': 0}
+
+    if len(order) > 3:
+        while stats['iterations'] < max_iterations and not _expired(deadline):
+            stats['iterations'] += 1
+            two_opt = two_opt_pass(cost, order, deadline)
+            or_opt = or_opt_pass(cost, order, deadline)
+            stats['two_opt_moves'] += two_opt
+            stats['or_opt_moves'] += or_opt
+            if not two_opt and not or_opt:
+                break
+
+    stats['elapsed_ms'] = (time.perf_counter() - started) * 1000
+    return order, tour_length(cost, order), stats
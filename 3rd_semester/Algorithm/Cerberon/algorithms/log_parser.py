@@ -0,0 +1,79 @@
+import bz2
+import gzip
+import lzma
+from collections import namedtuple
+
+SEVERITY_ORDER = {'INFO': 0, 'WARNING': 1, 'ERROR': 2, 'CRITICAL': 3}
+SEVERITIES = list(SEVERITY_ORDER)
+
+# One parsed line: "2023-05-01 08:15:23 WARNING Firewall blocked ..."
+LogRecord = namedtuple('LogRecord', ['lineno', 'date', 'time_seconds', 'severity', 'message', 'line'])
+
+# Compressed inputs are recognized by their magic bytes, not their names
+COMPRESSION_MAGIC = [
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+]
+
+MAX_ERROR_SAMPLES = 10
+
+def open_log(filename):
+    """Open a plain, gzip, bzip2 or xz log for reading text"""
+    with open(filename, 'rb') as file:
+        magic = file.read(6)
+    for prefix, opener in COMPRESSION_MAGIC:
+        if magic.startswith(prefix):
+            return opener(filename, 'rt', encoding='utf-8', errors='replace')
+    return open(filename, 'r', encoding='utf-8', errors='replace')
+
+def parse_time(text):
+    """HH:MM:SS as seconds since midnight"""
+    h, m, s = map(int, text.split(':'))
+    if not (0 <= h < 24 and 0 <= m < 60 and 0 <= s < 60):
+        raise ValueError(f"Invalid time {text}")
+    return h * 3600 + m * 60 + s
+
+def parse_line(line, lineno=0):
+    """Tokenize a stripped log line once into a LogRecord"""
+    parts = line.split(None, 3)
+    if len(parts) < 3:
+        raise ValueError(f"Expected 'date time severity message', got {line!r}")
+    severity = parts[2]
+    if severity not in SEVERITY_ORDER:
+        raise ValueError(f"Unknown severity {severity}")
+    return LogRecord(lineno, parts[0], parse_time(parts[1]), severity, parts[3] if len(parts) > 3 else '', line)
+
+def parse_stats():
+    return {'lines': 0, 'records': 0, 'errors': 0, 'error_samples': []}
+
+def parse_log(filename, errors='skip', stats=None):
+    """Stream LogRecords from ``filename`` one line at a time.
+
+    With ``errors='skip'`` malformed lines are dropped and counted in
+    ``stats`` (with the first few kept as samples); ``errors='strict'``
+    raises ValueError on the first one instead. Memory use does not depend
+    on the size of the file.
+    """
+    if errors not in ('skip', 'strict'):
+        raise ValueError(f"Unknown error mode {errors}. Available modes: ['skip', 'strict']")
+    if stats is None:
+        stats = parse_stats()
+
+    with open_log(filename) as file:
+        for lineno, raw in enumerate(file, 1):
+            line = raw.strip()
+            if not line:
+                continue
+            stats['lines'] += 1
+            try:
+                record = parse_line(line, lineno)
+            except ValueError as e:
+                if errors == 'strict':
+                    raise ValueError(f"{filename}:{lineno}: {e}") from None
+                stats['errors'] += 1
+                if len(stats['error_samples']) < MAX_ERROR_SAMPLES:
+                    stats['error_samples'].append({'line': lineno, 'error': str(e)})
+                continue
+            stats['records'] += 1
+            yield record
@@ -0,0 +1,163 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from algorithms.log_parser import SEVERITIES, SEVERITY_ORDER, parse_log, parse_stats, parse_time
+from algorithms.versioned_cache import VersionedFileCache
+
+_SET_BYTES = re.compile(rb'[^\x00]')
+
+class LogStore:
+    """One version of a parsed log, held column by column.
+
+    ``time_seconds`` and ``lineno`` are ``array('i')``, ``severity`` is one
+    code byte per record and the lines live in a single UTF-8 buffer with
+    ``offsets[i]``/``offsets[i + 1]`` bounding line ``i`` and
+    ``message_offsets[i]`` where its message starts. ``time_order`` lists
+    the record ids by time (file order on ties) next to ``sorted_times`` for
+    bisecting, and ``bitmaps[severity]`` has bit ``i`` set for every record
+    of that severity.
+    """
+
+    def __init__(self, version, records, parse):
+        self.version = version
+        self.parse = parse
+        self.time_seconds = array('i')
+        self.lineno = array('i')
+        self.offsets = array('q', [0])
+        self.message_offsets = array('q')
+        severity = bytearray()
+        buffer = bytearray()
+        for record in records:
+            line = record.line.encode('utf-8')
+            self.time_seconds.append(record.time_seconds)
+            self.lineno.append(record.lineno)
+            severity.append(SEVERITY_ORDER[record.severity])
+            # The message is the tail of the stripped line
+            self.message_offsets.append(len(buffer) + len(line) - len(record.message.encode('utf-8')))
+            buffer += line
+            self.offsets.append(len(buffer))
+        self.severity = bytes(severity)
+        self.buffer = bytes(buffer)
+
+        self.time_order = array('i', sorted(range(len(self)), key=self.time_seconds.__getitem__))
+        self.sorted_times = array('i', (self.time_seconds[i] for i in self.time_order))
+
+        bitmaps = [bytearray((len(self) + 7) // 8) for _ in SEVERITIES]
+        counts = [0] * len(SEVERITIES)
+        for i, code in enumerate(self.severity):
+            bitmaps[code][i >> 3] |= 1 << (i & 7)
+            counts[code] += 1
+        self.bitmaps = {name: bytes(bitmap) for name, bitmap in zip(SEVERITIES, bitmaps)}
+        self.counts = dict(zip(SEVERITIES, counts))
+        self._masks = {}
+
+    def __len__(self):
+        return len(self.time_seconds)
+
+    def line(self, i):
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def message(self, i):
+        return self.buffer[self.message_offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def lines(self, ids=None):
+        """Lines of ``ids`` (all records in file order by default)"""
+        return [self.line(i) for i in (range(len(self)) if ids is None else ids)]
+
+    def record(self, i):
+        return {
+            'id': i,
+            'lineno': self.lineno[i],
+            'time_seconds': self.time_seconds[i],
+            'severity': SEVERITIES[self.severity[i]],
+            'message': self.message(i),
+            'line': self.line(i)
+        }
+
+    def mask(self, severities):
+        """Bitmap of the records whose severity is in ``severities``, OR-ed
+        together once per combination"""
+        key = frozenset(severities)
+        mask = self._masks.get(key)
+        if mask is None:
+            combined = 0
+            for name in key:
+                combined |= int.from_bytes(self.bitmaps[name], 'little')
+            mask = self._masks[key] = combined.to_bytes(len(self.bitmaps[SEVERITIES[0]]), 'little')
+        return mask
+
+    def time_range(self, start=None, end=None):
+        """Positions ``[lo, hi)`` in ``time_order`` of the records with
+        ``start <= time_seconds <= end``"""
+        lo = 0 if start is None else bisect_left(self.sorted_times, start)
+        hi = len(self) if end is None else bisect_right(self.sorted_times, end)
+        return lo, max(lo, hi)
+
+    def query(self, start=None, end=None, severities=None):
+        """Ids of the records in ``[start, end]`` (seconds since midnight)
+        with one of ``severities``, ordered by time.
+
+        Works from whichever index is more selective: the time range is
+        bisected and its records checked against the severity bitmap, or the
+        set bits of the bitmap are read and checked against the range.
+        Returns ``(ids, strategy)``.
+        """
+        lo, hi = self.time_range(start, end)
+        if lo == hi:
+            return [], 'time'
+        if severities is None or set(severities) >= set(SEVERITIES):
+            return list(self.time_order[lo:hi]), 'time'
+
+        mask = self.mask(severities)
+        if hi - lo <= sum(self.counts[name] for name in set(severities)):
+            return [i for i in self.time_order[lo:hi] if mask[i >> 3] >> (i & 7) & 1], 'time'
+
+        start, end = self.sorted_times[lo], self.sorted_times[hi - 1]
+        ids = []
+        # Scans the bitmap a byte at a time in C, skipping empty bytes
+        for match in _SET_BYTES.finditer(mask):
+            base = match.start() << 3
+            byte = mask[match.start()]
+            for bit in range(8):
+                if byte >> bit & 1 and start <= self.time_seconds[base + bit] <= end:
+                    ids.append(base + bit)
+        ids.sort(key=lambda i: (self.time_seconds[i], i))
+        return ids, 'severity'
+
+    def summary(self):
+        return {
+            'version': self.version,
+            'records': len(self),
+            'severities': dict(self.counts),
+            'first_time': self.sorted_times[0] if len(self) else None,
+            'last_time': self.sorted_times[-1] if len(self) else None,
+            'parse': self.parse
+        }
+
+def parse_clock(text):
+    """HH:MM or HH:MM:SS as seconds since midnight"""
+    text = text.strip()
+    return parse_time(text + ':00' if text.count(':') == 1 else text)
+
+def parse_severities(text):
+    """Comma-separated severities; ``ERROR+`` means ERROR and everything above"""
+    severities = set()
+    for item in text.split(','):
+        item = item.strip().upper()
+        if not item:
+            continue
+        name = item.rstrip('+')
+        if name not in SEVERITY_ORDER:
+            raise ValueError(f"Unknown severity {name}. Available severities: {SEVERITIES}")
+        severities.update(SEVERITIES[SEVERITY_ORDER[name]:] if item.endswith('+') else [name])
+    return severities or None
+
+def _load_store(filename, version):
+    parse = parse_stats()
+    return LogStore(version, parse_log(filename, stats=parse), parse)
+
+_stores = VersionedFileCache(_load_store)
+
+def get_log_store(filename):
+    """Process-wide columnar store for ``filename``, reparsed only when the file changes"""
+    return _stores.get(filename)
@@ -1,27 +1,37 @@
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
+import tempfile
 import time
+from operator import itemgetter
+from algorithms import render_service
+from algorithms.external_sort import external_sort_logs
+from algorithms.parallel_sort import parallel_merge_sort
+from algorithms.log_parser import SEVERITIES, SEVERITY_ORDER
+from algorithms.log_store import get_log_store
+from algorithms.radix_sort import sort_by_severity_time, sort_by_time
+from algorithms.step_trace import StepTracer, make_tracer
 
-def merge_sort(arr, steps=None, level=0):
-    if steps is None:
-        steps = []
+def merge_sort(arr, steps=None, level=0, tracer=None):
+    tracer = make_tracer(tracer, steps)
     
     if len(arr) > 1:
         mid = len(arr) // 2
         left = arr[:mid]
         right = arr[mid:]
         
-        steps.append({
-            'action': 'split',
-            'left': left.copy(),
-            'right': right.copy(),
-            'full': [x[0] for x in arr],  # Extract just the time_seconds for visualization
-            'level': level
-        })
+        # Only the time_seconds keys are kept for visualization
+        if tracer.step('split'):
+            tracer.record({
+                'action': 'split',
+                'left': [x[0] for x in left],
+                'right': [x[0] for x in right],
+                'full': [x[0] for x in arr],
+                'level': level
+            })
         
-        left, steps = merge_sort(left, steps, level+1)
-        right, steps = merge_sort(right, steps, level+1)
+        left, _ = merge_sort(left, level=level+1, tracer=tracer)
+        right, _ = merge_sort(right, level=level+1, tracer=tracer)
         
         i = j = k = 0
         
@@ -44,16 +54,18 @@ def merge_sort(arr, steps=None, level=0):
             j += 1
             k += 1
         
-        steps.append({
-            'action': 'merge',
-            'result': [x[0] for x in arr],  # Extract just the time_seconds for visualization
-            'left': [x[0] for x in left],
-            'right': [x[0] for x in right],
-            'full': [x[0] for x in arr],
-            'level': level
-        })
-    
-    return arr, steps
+        if tracer.step('merge'):
+            merged = [x[0] for x in arr]
+            tracer.record({
+                'action': 'merge',
+                'result': merged,
+                'left': [x[0] for x in left],
+                'right': [x[0] for x in right],
+                'full': merged,
+                'level': level
+            })
+    
+    return arr, tracer.steps
 
 def visualize_sort(steps):
     plt.figure(figsize=(12, 8))
@@ -95,48 +107,110 @@ def visualize_sort(steps):
     plt.close()
     return base64.b64encode(img.getvalue()).decode('utf-8')
 
-def analyze_logs(log_file):
-    with open(log_file, 'r') as file:
-        logs = [line.strip() for line in file]
+SORT_MODES = ('memory', 'external')
+
+def analyze_logs_external(log_file, output_folder=None, chunk_size=100_000):
+    """analyze_logs for logs larger than RAM: both orderings are written to
+    files by external merge sort and only a preview is returned"""
+    result = external_sort_logs(log_file, output_folder or tempfile.gettempdir(), chunk_size)
     
-    # Extract timestamps and severity levels
-    timestamps = [log.split()[1] for log in logs]
-    severities = [log.split()[2] for log in logs]
+    return {
+        'mode': 'external',
+        'sorted_by_time': result['time']['preview'],
+        'sorted_by_severity': result['severity']['preview'],
+        'sorted_by_time_file': result['time']['output'],
+        'sorted_by_severity_file': result['severity']['output'],
+        'records': result['time']['records'],
+        'runs': result['runs'],
+        'spill_duration': result['spill_duration'],
+        'time_sort_duration': result['time']['merge_duration'],
+        'severity_sort_duration': result['severity']['merge_duration'],
+        'parse': result['parse'],
+        'time_sort_image': None,
+        'severity_sort_image': None
+    }
+
+SORT_ENGINES = ('merge', 'counting', 'radix', 'parallel')
+
+def sort_engine(engine, log_data, severity_data, workers=None, parallel_min_size=100_000):
+    """Sort the records by time and by severity with one engine, timing each
+    with tracing off. Returns (by_time, by_severity, durations)."""
+    start_time = time.perf_counter()
+    if engine == 'merge':
+        by_time, _ = merge_sort(log_data.copy(), tracer=StepTracer('off'))
+    elif engine == 'parallel':
+        by_time = parallel_merge_sort(log_data, itemgetter(0), workers, parallel_min_size)
+    else:
+        by_time = sort_by_time(log_data, engine)
+    time_duration = time.perf_counter() - start_time
     
-    # Convert timestamps to seconds since midnight for sorting
-    time_seconds = []
-    for ts in timestamps:
-        h, m, s = map(int, ts.split(':'))
-        time_seconds.append(h * 3600 + m * 60 + s)
+    start_time = time.perf_counter()
+    if engine == 'merge':
+        by_severity, _ = merge_sort(severity_data.copy(), tracer=StepTracer('off'))
+    elif engine == 'parallel':
+        by_severity = parallel_merge_sort(severity_data, itemgetter(0, 1), workers, parallel_min_size)
+    else:
+        by_severity = sort_by_severity_time(log_data, SEVERITY_ORDER, engine)
+    severity_duration = time.perf_counter() - start_time
     
-    # Create a list of tuples for sorting (time_seconds, severity, log)
-    log_data = list(zip(time_seconds, severities, logs))
+    # Convert back to original format
+    if engine in ('merge', 'parallel'):
+        by_severity = [(ts, SEVERITIES[sev], log) for sev, ts, log in by_severity]
+    
+    return by_time, by_severity, {'time': time_duration, 'severity': severity_duration}
+
+def analyze_logs(log_file, render=None, trace='full', trace_every=10, mode='memory', output_folder=None,
+                 chunk_size=100_000, engine='merge', workers=None, parallel_min_size=100_000, compare=False):
+    if mode not in SORT_MODES:
+        raise ValueError(f"Unknown sort mode {mode}. Available modes: {list(SORT_MODES)}")
+    if engine not in SORT_ENGINES:
+        raise ValueError(f"Unknown sort engine {engine}. Available engines: {list(SORT_ENGINES)}")
+    if mode == 'external':
+        return analyze_logs_external(log_file, output_folder, chunk_size)
     
-    # Sort by time
-    start_time = time.time()
-    sorted_by_time, time_steps = merge_sort(log_data.copy())
-    time_sort_duration = time.time() - start_time
+    render = render_service.resolve(render)
+    
+    # Parsed once per version of the file, shared with the other log views
+    store = get_log_store(log_file)
+    parse = store.parse
+    log_data = list(zip(store.time_seconds, [SEVERITIES[code] for code in store.severity], store.lines()))
     
     # Sort by severity (convert severity to numerical value for comparison)
-    severity_order = {'INFO': 0, 'WARNING': 1, 'ERROR': 2, 'CRITICAL': 3}
-    severity_data = [(severity_order[sev], ts, log) for ts, sev, log in log_data]
+    severity_data = [(SEVERITY_ORDER[sev], ts, log) for ts, sev, log in log_data]
     
-    start_time = time.time()
-    sorted_by_severity, severity_steps = merge_sort(severity_data.copy())
-    severity_sort_duration = time.time() - start_time
+    # Only the selected engine runs; compare times every engine on the same records.
+    # The linear-time engines order by (severity, time) where merge sort orders by severity alone
+    engine_durations = {}
+    for name in (SORT_ENGINES if compare else (engine,)):
+        by_time, by_severity, durations = sort_engine(name, log_data, severity_data, workers, parallel_min_size)
+        engine_durations[name] = durations
+        if name == engine:
+            sorted_by_time, sorted_by_severity = by_time, by_severity
+            time_sort_duration, severity_sort_duration = durations['time'], durations['severity']
     
-    # Convert back to original format
-    sorted_by_severity = [(ts, ['INFO', 'WARNING', 'ERROR', 'CRITICAL'][sev], log) 
-                         for sev, ts, log in sorted_by_severity]
+    # Separate untimed runs record the trace at the requested level
+    time_trace = StepTracer(trace, trace_every)
+    severity_trace = StepTracer(trace, trace_every)
+    if time_trace.enabled:
+        merge_sort(log_data.copy(), tracer=time_trace)
+        merge_sort(severity_data.copy(), tracer=severity_trace)
     
-    time_img = visualize_sort(time_steps)
-    severity_img = visualize_sort(severity_steps)
+    # Both figures render concurrently
+    time_img = render(visualize_sort, time_trace.steps) if time_trace.steps else render_service.skip(visualize_sort)
+    severity_img = (render(visualize_sort, severity_trace.steps) if severity_trace.steps
+                    else render_service.skip(visualize_sort))
     
     return {
         'sorted_by_time': [log for _, _, log in sorted_by_time],
         'sorted_by_severity': [log for _, _, log in sorted_by_severity],
         'time_sort_duration': time_sort_duration,
         'severity_sort_duration': severity_sort_duration,
-        'time_sort_image': time_img,
-        'severity_sort_image': severity_img
+        'mode': 'memory',
+        'engine': engine,
+        'engine_durations': engine_durations,
+        'parse': parse,
+        'time_sort_trace': time_trace.summary(),
+        'severity_sort_trace': severity_trace.summary(),
+        'time_sort_image': time_img.result(),
+        'severity_sort_image': severity_img.result()
     }
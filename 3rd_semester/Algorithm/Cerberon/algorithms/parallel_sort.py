@@ -0,0 +1,79 @@
+import heapq
+import math
+from algorithms import pools
+
+INSERTION_RUN = 32
+
+def _insertion_sort_runs(keys, values, width):
+    """Sort every ``width``-long slice in place, stably"""
+    n = len(keys)
+    for start in range(0, n, width):
+        for i in range(start + 1, min(start + width, n)):
+            key, value = keys[i], values[i]
+            j = i - 1
+            while j >= start and keys[j] > key:
+                keys[j + 1] = keys[j]
+                values[j + 1] = values[j]
+                j -= 1
+            keys[j + 1] = key
+            values[j + 1] = value
+
+def bottom_up_merge_sort(arr, key=None):
+    """Stable iterative merge sort returning a new list.
+
+    Keys are computed once. Short runs are insertion-sorted, then runs of
+    width 32, 64, 128, ... are merged back and forth between two buffers
+    that are allocated once, with no slicing or recursion.
+    """
+    n = len(arr)
+    values = list(arr)
+    keys = [key(value) for value in values] if key is not None else list(values)
+    _insertion_sort_runs(keys, values, INSERTION_RUN)
+
+    other_keys = [None] * n
+    other_values = [None] * n
+    width = INSERTION_RUN
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                # <= takes from the left run on ties, which keeps the sort stable
+                if keys[i] <= keys[j]:
+                    other_keys[k] = keys[i]
+                    other_values[k] = values[i]
+                    i += 1
+                else:
+                    other_keys[k] = keys[j]
+                    other_values[k] = values[j]
+                    j += 1
+                k += 1
+            other_keys[k:k + mid - i] = keys[i:mid]
+            other_values[k:k + mid - i] = values[i:mid]
+            k += mid - i
+            other_keys[k:k + hi - j] = keys[j:hi]
+            other_values[k:k + hi - j] = values[j:hi]
+        keys, other_keys = other_keys, keys
+        values, other_values = other_values, values
+        width *= 2
+
+    return values
+
+def parallel_merge_sort(arr, key=None, workers=None, min_size=100_000):
+    """Stable merge sort fanned out over a process pool.
+
+    The input is cut into one contiguous partition per worker, each sorted
+    with ``bottom_up_merge_sort`` in its own process, and the sorted
+    partitions are combined with a k-way ``heapq.merge``. ``key`` must be
+    picklable (e.g. ``operator.itemgetter``). Inputs below ``min_size`` or a
+    single worker sort in-process.
+    """
+    workers = pools.default_workers(workers)
+    if workers == 1 or len(arr) < max(min_size, 2):
+        return bottom_up_merge_sort(arr, key)
+
+    size = math.ceil(len(arr) / workers)
+    executor = pools.get_pool('compute', workers)
+    futures = [executor.submit(bottom_up_merge_sort, arr[i:i + size], key) for i in range(0, len(arr), size)]
+    return list(heapq.merge(*(future.result() for future in futures), key=key))
@@ -0,0 +1,188 @@
+import mmap
+import os
+import tempfile
+import threading
+import numpy as np
+from algorithms.step_trace import make_tracer
+from algorithms.versioned_cache import VersionedFileCache
+
+class PasswordIndex:
+    """Sorted wordlist served straight from a memory-mapped sidecar file.
+
+    The sidecar holds the stripped passwords sorted bytewise (UTF-8 byte
+    order is code point order, so this is the order ``sorted()`` gives the
+    strings), one per line. ``offsets[i]`` is where entry ``i`` starts and
+    ``offsets[-1]`` the file size, both memory-mapped, so an index of any
+    size costs a few pages of RSS and lookups decode nothing but the entries
+    they report.
+    """
+
+    def __init__(self, version, filename, offsets_file):
+        self.version = version
+        self.offsets = np.load(offsets_file, mmap_mode='r')
+        # The map keeps its own descriptor, and both maps are released once
+        # the last reference to a superseded index is dropped
+        with open(filename, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def key(self, i):
+        """Entry ``i`` as raw bytes"""
+        return self._data[self.offsets[i]:self.offsets[i + 1] - 1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('password index out of range')
+        return self.key(i).decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.key(i).decode('utf-8')
+
+    def bisect_left(self, target):
+        """First position whose entry is >= ``target`` (bytes)"""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __contains__(self, password):
+        target = password.encode('utf-8')
+        i = self.bisect_left(target)
+        return i < len(self) and self.key(i) == target
+
+    def gallop(self, target, lo=0):
+        """``bisect_left`` for a target known to be >= every entry before
+        ``lo``: probes lo, lo+1, lo+3, ... then bisects the last gap.
+        Returns ``(position, comparisons)``."""
+        n = len(self)
+        comparisons = 0
+        step = 1
+        hi = lo
+        while hi < n:
+            comparisons += 1
+            if self.key(hi) >= target:
+                break
+            lo = hi + 1
+            hi = lo + step
+            step *= 2
+        hi = min(hi, n)
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            comparisons += 1
+            if self.key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, comparisons
+
+    def batch_contains(self, candidates):
+        """Membership of every candidate in one merge pass over the index.
+
+        Candidates are sorted and each search gallops forward from where the
+        previous one ended, so m lookups cost O(m log(n/m)) comparisons
+        instead of m full binary searches. Returns ``(found, comparisons)``
+        with ``found`` aligned to ``candidates``.
+        """
+        keys = [candidate.encode('utf-8') for candidate in candidates]
+        found = [False] * len(keys)
+        position = 0
+        comparisons = 0
+        for i in sorted(range(len(keys)), key=keys.__getitem__):
+            position, count = self.gallop(keys[i], position)
+            comparisons += count
+            found[i] = position < len(self) and self.key(position) == keys[i]
+        return found, comparisons
+
+    def binary_search(self, target, tracer=None):
+        """``binary_search.binary_search`` on bytes, same steps"""
+        tracer = make_tracer(tracer)
+        needle = target.encode('utf-8')
+        left, right = 0, len(self) - 1
+        while left <= right:
+            mid = (left + right) // 2
+            current = self.key(mid)
+            if tracer.step('probe'):
+                tracer.record({
+                    'left': left,
+                    'right': right,
+                    'mid': mid,
+                    'current': current.decode('utf-8'),
+                    'target': target
+                })
+            if current == needle:
+                return True, tracer.steps
+            elif current < needle:
+                left = mid + 1
+            else:
+                right = mid - 1
+        return False, tracer.steps
+
+def build_sidecar(source, filename, offsets_file):
+    """Write the sorted wordlist and its offsets array next to each other"""
+    with open(source, 'rb') as file:
+        passwords = sorted(line.strip() for line in file)
+
+    lengths = np.fromiter((len(password) + 1 for password in passwords), dtype=np.int64, count=len(passwords))
+    offsets = np.zeros(len(passwords) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    # Write under temporary names so a concurrent reader never maps a half-written file
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(filename + suffix, 'wb') as file:
+        for password in passwords:
+            file.write(password + b'\n')
+    with open(offsets_file + suffix, 'wb') as file:
+        np.save(file, offsets)
+    os.replace(offsets_file + suffix, offsets_file)
+    os.replace(filename + suffix, filename)
+
+def remove_stale_sidecars(folder, prefix, version):
+    """Delete the sidecars of every other version of the wordlist ``prefix``"""
+    keep = {f"{prefix}-{version}.sorted", f"{prefix}-{version}.offsets.npy"}
+    for name in os.listdir(folder):
+        if name.startswith(prefix + '-') and name.endswith(('.sorted', '.offsets.npy')) and name not in keep:
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                # Still mapped somewhere that can't unlink open files, next load retries
+                pass
+
+def load_password_index(source, version, folder=None):
+    """PasswordIndex for ``source``, reusing a sidecar built for this version
+    and removing those left by earlier versions"""
+    folder = folder or os.path.join(tempfile.gettempdir(), 'cerberon-passwords')
+    os.makedirs(folder, exist_ok=True)
+    prefix = os.path.basename(source)
+    filename = os.path.join(folder, f"{prefix}-{version}.sorted")
+    offsets_file = os.path.join(folder, f"{prefix}-{version}.offsets.npy")
+
+    if not (os.path.exists(filename) and os.path.exists(offsets_file)):
+        build_sidecar(source, filename, offsets_file)
+    index = PasswordIndex(version, filename, offsets_file)
+    remove_stale_sidecars(folder, prefix, version)
+    return index
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_password_index(filename, folder=None):
+    """The index for the current contents of ``filename``, built once per version"""
+    with _indexes_lock:
+        cache = _indexes.get(folder)
+        if cache is None:
+            cache = _indexes[folder] = VersionedFileCache(
+                lambda source, version: load_password_index(source, version, folder))
+    return cache.get(filename)
@@ -0,0 +1,53 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Named pools: 'compute' is shared by the CPU-bound engines (parallel sort, TSP
+# multi-start) so they never hold more than one set of processes between them,
+# 'render' runs the matplotlib figures
+_pools = {}
+_lock = threading.Lock()
+
+def default_workers(workers=None):
+    """``workers``, or one per core when it is 0/None"""
+    return workers or os.cpu_count() or 1
+
+def _ready():
+    return os.getpid()
+
+def get_pool(name, workers, initializer=None, warm=False):
+    """The process pool registered as ``name``, created on first use.
+
+    A pool only grows: it is rebuilt when more workers are asked for than it
+    has, while smaller requests reuse it and bound their parallelism through
+    the number of tasks they submit. Workers are spawned, not forked, since
+    the web server process is multi-threaded. With ``warm`` every worker is
+    running before the pool is returned.
+    """
+    with _lock:
+        pool = _pools.get(name)
+        if pool is None or pool['workers'] < workers:
+            if pool is not None:
+                pool['executor'].shutdown(wait=False)
+            pool = _pools[name] = {
+                'executor': ProcessPoolExecutor(max_workers=workers,
+                                                mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=initializer),
+                'workers': workers,
+                'warm': False
+            }
+        if warm and not pool['warm']:
+            # Submitting one task per worker before any is idle starts them all
+            for future in [pool['executor'].submit(_ready) for _ in range(pool['workers'])]:
+                future.result()
+            pool['warm'] = True
+        return pool['executor']
+
+def shutdown(name=None):
+    """Stop the pool ``name`` (every pool by default); the next ``get_pool`` starts afresh"""
+    with _lock:
+        for key in ([name] if name is not None else list(_pools)):
+            pool = _pools.pop(key, None)
+            if pool is not None:
+                pool['executor'].shutdown(wait=False)
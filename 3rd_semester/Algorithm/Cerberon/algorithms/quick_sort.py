@@ -1,43 +1,150 @@
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
+import random
 import time
+from operator import itemgetter
+from algorithms import render_service
+from algorithms.log_store import get_log_store
+from algorithms.selection import P2Quantile, introselect, median_of_three, partition3, stream_anomalies, top_k_indices
+from algorithms.step_trace import StepTracer, make_tracer
 
-def quick_sort(arr, steps=None, level=0, side='root'):
-    if steps is None:
-        steps = []
+def _value(x):
+    # Records are (response_time, log) tuples, only the number is drawn
+    return x[0] if isinstance(x, tuple) else x
+
+def quick_sort(arr, steps=None, level=0, side='root', tracer=None):
+    tracer = make_tracer(tracer, steps)
     
     if len(arr) <= 1:
-        return arr, steps
+        return arr, tracer.steps
     
     pivot = arr[len(arr) // 2]
     left = [x for x in arr if x < pivot]
     middle = [x for x in arr if x == pivot]
     right = [x for x in arr if x > pivot]
     
-    steps.append({
-        'level': level,
-        'side': side,
-        'pivot': pivot,
-        'left': left.copy(),
-        'middle': middle.copy(),
-        'right': right.copy(),
-        'full': arr.copy()
-    })
+    full = None
+    if tracer.step('partition'):
+        full = [_value(x) for x in arr]
+        tracer.record({
+            'level': level,
+            'side': side,
+            'pivot': _value(pivot),
+            'left': [_value(x) for x in left],
+            'middle': [_value(x) for x in middle],
+            'right': [_value(x) for x in right],
+            'full': full
+        })
     
-    left_sorted, steps = quick_sort(left, steps, level+1, 'left')
-    right_sorted, steps = quick_sort(right, steps, level+1, 'right')
+    left_sorted, _ = quick_sort(left, level=level+1, side='left', tracer=tracer)
+    right_sorted, _ = quick_sort(right, level=level+1, side='right', tracer=tracer)
     
     result = left_sorted + middle + right_sorted
     
-    steps.append({
-        'level': level,
-        'side': side,
-        'result': result.copy(),
-        'full': arr.copy()
-    })
+    if tracer.step('combine'):
+        tracer.record({
+            'level': level,
+            'side': side,
+            'result': [_value(x) for x in result],
+            'full': full if full is not None else [_value(x) for x in arr]
+        })
+    
+    return result, tracer.steps
+
+INSERTION_THRESHOLD = 16
+
+def _insertion_sort(arr, lo, hi):
+    for i in range(lo + 1, hi + 1):
+        x = arr[i]
+        j = i - 1
+        while j >= lo and x < arr[j]:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = x
+
+def _sift_down(arr, lo, root, size):
+    """Restore the max-heap stored in arr[lo:lo+size] below ``root``"""
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            return
+        if child + 1 < size and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        if not arr[lo + root] < arr[lo + child]:
+            return
+        arr[lo + root], arr[lo + child] = arr[lo + child], arr[lo + root]
+        root = child
+
+def _heapsort(arr, lo, hi):
+    size = hi - lo + 1
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(arr, lo, root, size)
+    for end in range(size - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        _sift_down(arr, lo, 0, end)
+
+def introsort(arr, steps=None, tracer=None):
+    """In-place, iterative counterpart of quick_sort with the same step trace.
+    
+    Median-of-three pivots and a three-way partition, with an explicit stack
+    instead of recursion. The smaller side is always taken next so the stack
+    stays O(log n); ranges of at most 16 items are insertion-sorted and a
+    range still unsorted after 2*log2(n) levels is heapsorted, which bounds
+    the worst case to O(n log n).
+    """
+    tracer = make_tracer(tracer, steps)
+    
+    depth_limit = 2 * len(arr).bit_length()
+    stack = [(0, len(arr) - 1, 0, 'root')]
+    while stack:
+        lo, hi, level, side = stack.pop()
+        if hi <= lo:
+            continue
+        
+        if hi - lo < INSERTION_THRESHOLD or level >= depth_limit:
+            method = 'Insertion-sorted' if hi - lo < INSERTION_THRESHOLD else 'Heap-sorted'
+            traced = tracer.step('insertion' if method == 'Insertion-sorted' else 'heapsort')
+            full = [_value(x) for x in arr[lo:hi + 1]] if traced else None
+            if method == 'Insertion-sorted':
+                _insertion_sort(arr, lo, hi)
+            else:
+                _heapsort(arr, lo, hi)
+            if traced:
+                tracer.record({
+                    'level': level,
+                    'side': side,
+                    'method': method,
+                    'result': [_value(x) for x in arr[lo:hi + 1]],
+                    'full': full
+                })
+            continue
+        
+        pivot = median_of_three(arr, lo, hi)
+        traced = tracer.step('partition')
+        full = [_value(x) for x in arr[lo:hi + 1]] if traced else None
+        lt, gt = partition3(arr, lo, hi, pivot)
+        if traced:
+            tracer.record({
+                'level': level,
+                'side': side,
+                'pivot': _value(pivot),
+                'left': [_value(x) for x in arr[lo:lt]],
+                'middle': [_value(x) for x in arr[lt:gt + 1]],
+                'right': [_value(x) for x in arr[gt + 1:hi + 1]],
+                'full': full
+            })
+        
+        left = (lo, lt - 1, level + 1, 'left')
+        right = (gt + 1, hi, level + 1, 'right')
+        if lt - lo < hi - gt:
+            stack.extend((right, left))
+        else:
+            stack.extend((left, right))
     
-    return result, steps
+    return arr, tracer.steps
+
+QUICK_SORT_ENGINES = {'quick': quick_sort, 'intro': introsort}
 
 def visualize_quick_sort(steps):
     plt.figure(figsize=(12, 8))
@@ -52,7 +159,7 @@ def visualize_quick_sort(steps):
             plt.title(f"Level {step['level']} ({step['side']}): Pivot = {step['pivot']}")
         else:
             plt.bar(range(len(step['result'])), step['result'])
-            plt.title(f"Level {step['level']} ({step['side']}): Merged {len(step['result'])} elements")
+            plt.title(f"Level {step['level']} ({step['side']}): {step.get('method', 'Merged')} {len(step['result'])} elements")
         
         plt.grid(True)
     
@@ -64,38 +171,102 @@ def visualize_quick_sort(steps):
     plt.close()
     return base64.b64encode(img.getvalue()).decode('utf-8')
 
-def detect_anomalies(log_file):
-    with open(log_file, 'r') as file:
-        logs = [line.strip() for line in file]
-    
-    # Extract response times (simulated for this example)
-    # In a real system, these would come from actual log data
-    import random
-    response_times = [random.randint(50, 200) for _ in logs]  # Most between 50-200ms
-    # Add some anomalies
-    response_times[2] = 1500  # Database timeout
-    response_times[5] = 2500  # Disk space critical
-    
-    # Create list of tuples (time, log)
-    log_data = list(zip(response_times, logs))
-    
-    # Sort by response time
-    start_time = time.time()
-    sorted_logs, steps = quick_sort(log_data.copy())
-    sort_duration = time.time() - start_time
-    
-    # Identify anomalies (top 10% slowest responses)
-    threshold = int(0.9 * len(sorted_logs))
-    normal_logs = sorted_logs[:threshold]
-    anomaly_logs = sorted_logs[threshold:]
+ANOMALY_MODES = ('sort', 'select', 'heap', 'stream')
+
+def simulated_response_times(logs):
+    """(response_time, log) pairs for a stream of log lines"""
+    # Simulated for this example, in a real system these would come from actual log data
+    for i, log in enumerate(logs):
+        if i == 2:
+            yield 1500, log  # Database timeout
+        elif i == 5:
+            yield 2500, log  # Disk space critical
+        else:
+            yield random.randint(50, 200), log  # Most between 50-200ms
+
+def detect_anomalies(log_file, render=None, trace='full', trace_every=10, mode='sort', percentile=0.9, engine='quick'):
+    """Split log lines into normal and anomalous (slowest ``1 - percentile``)
+    responses.
+    
+    ``sort`` fully sorts with the quick_sort or introsort ``engine``, ``select`` finds the cut with
+    introselect in expected O(n), ``heap`` keeps the slowest entries in a
+    bounded heap and ``stream`` flags lines online against a P-square
+    estimate of the percentile.
+    """
+    if mode not in ANOMALY_MODES:
+        raise ValueError(f"Unknown anomaly mode {mode}. Available modes: {list(ANOMALY_MODES)}")
+    if engine not in QUICK_SORT_ENGINES:
+        raise ValueError(f"Unknown sort engine {engine}. Available engines: {list(QUICK_SORT_ENGINES)}")
+    if not 0 < percentile < 1:
+        raise ValueError(f"Percentile must be between 0 and 1, got {percentile}")
+    render = render_service.resolve(render)
+    
+    store = get_log_store(log_file)
+    parse = store.parse
+    records = simulated_response_times(store.lines())
+    tracer = StepTracer('off')
+    sorted_logs = None
+    
+    if mode == 'stream':
+        # One pass as lines arrive, nothing is held but the result lists
+        estimator = P2Quantile(percentile)
+        normal_logs, anomaly_logs = [], []
+        start_time = time.perf_counter()
+        for record, _, flagged in stream_anomalies(records, percentile, key=itemgetter(0), estimator=estimator):
+            (anomaly_logs if flagged else normal_logs).append(record)
+        duration = time.perf_counter() - start_time
+        threshold = estimator.value()
+    
+    else:
+        log_data = list(records)
+        cut = int(percentile * len(log_data))
+        
+        if mode == 'sort':
+            # Timed with tracing off so the duration is the sort's own
+            start_time = time.perf_counter()
+            sort = QUICK_SORT_ENGINES[engine]
+            sorted_logs, _ = sort(log_data.copy(), tracer=StepTracer('off'))
+            duration = time.perf_counter() - start_time
+            normal_logs = sorted_logs[:cut]
+            anomaly_logs = sorted_logs[cut:]
+            
+            # A separate untimed run records the trace at the requested level
+            tracer = StepTracer(trace, trace_every)
+            if tracer.enabled:
+                sort(log_data.copy(), tracer=tracer)
+        
+        elif mode == 'select':
+            selected = log_data.copy()
+            start_time = time.perf_counter()
+            if cut < len(selected):
+                introselect(selected, cut)
+            normal_logs = selected[:cut]
+            anomaly_logs = sorted(selected[cut:])
+            duration = time.perf_counter() - start_time
+        
+        else:
+            start_time = time.perf_counter()
+            slowest = set(top_k_indices(log_data, len(log_data) - cut))
+            normal_logs = [record for i, record in enumerate(log_data) if i not in slowest]
+            anomaly_logs = sorted(log_data[i] for i in slowest)
+            duration = time.perf_counter() - start_time
+        
+        threshold = anomaly_logs[0][0] if anomaly_logs else None
     
     # Visualize
-    img = visualize_quick_sort(steps)
+    img = render(visualize_quick_sort, tracer.steps) if tracer.steps else render_service.skip(visualize_quick_sort)
     
     return {
-        'sorted_logs': [log for _, log in sorted_logs],
+        'mode': mode,
+        'engine': engine if mode == 'sort' else None,
+        'sorted_logs': [log for _, log in sorted_logs] if sorted_logs is not None else None,
         'normal_logs': [log for _, log in normal_logs],
         'anomaly_logs': [log for _, log in anomaly_logs],
-        'sort_duration': sort_duration,
-        'visualization': img
-    }
\ No newline at end of file
+        'percentile': percentile,
+        'threshold': threshold,
+        'duration': duration,
+        'sort_duration': duration if mode == 'sort' else None,
+        'parse': parse,
+        'trace': tracer.summary(),
+        'visualization': img.result()
+    }
@@ -0,0 +1,48 @@
+SECONDS_PER_DAY = 86400
+
+def counting_sort(records, keys, key_range):
+    """Stable O(n + key_range) sort by precomputed integer ``keys`` in
+    [0, key_range).
+
+    Records are distributed into one bucket per key value and read back in
+    bucket order, which keeps equal keys in input order.
+    """
+    # Buckets are created on first use, wide key ranges are mostly empty
+    buckets = [None] * key_range
+    for record, key in zip(records, keys):
+        bucket = buckets[key]
+        if bucket is None:
+            buckets[key] = [record]
+        else:
+            bucket.append(record)
+    return [record for bucket in buckets if bucket is not None for record in bucket]
+
+def radix_sort(records, keys, max_key, radix_bits=10):
+    """Stable LSD radix sort by non-negative integer ``keys`` up to
+    ``max_key``: one counting-sort pass per ``radix_bits``-bit digit, least
+    significant first"""
+    radix = 1 << radix_bits
+    mask = radix - 1
+    # Sort (key, record) pairs so the keys travel with their records between passes
+    pairs = list(zip(keys, records))
+    shift = 0
+    while shift == 0 or max_key >> shift:
+        pairs = counting_sort(pairs, [(key >> shift) & mask for key, _ in pairs], radix)
+        shift += radix_bits
+    return [record for _, record in pairs]
+
+def sort_by_time(records, engine='counting'):
+    """(time_seconds, severity, log) records ordered by time of day"""
+    keys = [record[0] for record in records]
+    if engine == 'counting':
+        return counting_sort(records, keys, SECONDS_PER_DAY)
+    return radix_sort(records, keys, SECONDS_PER_DAY - 1)
+
+def sort_by_severity_time(records, severity_order, engine='counting'):
+    """Records ordered by (severity, time) in a single pass over the
+    composite key ``severity * 86400 + time_seconds``"""
+    keys = [severity_order[severity] * SECONDS_PER_DAY + seconds for seconds, severity, _ in records]
+    key_range = len(severity_order) * SECONDS_PER_DAY
+    if engine == 'counting':
+        return counting_sort(records, keys, key_range)
+    return radix_sort(records, keys, key_range - 1)
@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import Future
+from algorithms import pools
+
+_workers = 2
+_lock = threading.Lock()
+# pyplot keeps global state, in-process rendering must be serialized
+_inline_lock = threading.Lock()
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401  preload so the first job doesn't pay for it
+
+def configure(workers):
+    """Set the number of render processes; 0 renders in the calling process"""
+    global _workers
+    with _lock:
+        if workers != _workers:
+            pools.shutdown('render')
+        _workers = workers
+
+def _get_executor():
+    return pools.get_pool('render', _workers, _init_worker)
+
+def render_inline(func, *args, **kwargs):
+    """Run a figure function here and wrap the result in a completed Future"""
+    future = Future()
+    with _inline_lock:
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+    return future
+
+def submit(func, *args, **kwargs):
+    """Render ``func(*args, **kwargs)`` on a worker process.
+
+    ``func`` must be a module-level visualize function and its arguments
+    picklable. Returns a Future with whatever ``func`` returns (the base64
+    PNG for every visualize function).
+    """
+    if not _workers:
+        return render_inline(func, *args, **kwargs)
+    return _get_executor().submit(func, *args, **kwargs)
+
+def skip(func, *args, **kwargs):
+    """Render nothing: a completed Future holding None"""
+    future = Future()
+    future.set_result(None)
+    return future
+
+def resolve(render):
+    """The render callable for an analyzer's ``render`` argument: None means
+    the worker pool, False skips figures altogether"""
+    if render is None:
+        return submit
+    if render is False:
+        return skip
+    return render
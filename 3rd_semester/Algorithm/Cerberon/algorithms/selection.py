@@ -0,0 +1,162 @@
+import heapq
+
+def median_of_three(arr, lo, hi):
+    """Median of the first, middle and last items of arr[lo:hi+1]"""
+    a, b, c = arr[lo], arr[(lo + hi) // 2], arr[hi]
+    if a < b:
+        return b if b < c else (c if a < c else a)
+    return a if a < c else (c if b < c else b)
+
+def _median_of_medians(arr, lo, hi):
+    """Pivot guaranteed to fall between the 30th and 70th percentile"""
+    medians = []
+    for start in range(lo, hi + 1, 5):
+        group = sorted(arr[start:min(start + 5, hi + 1)])
+        medians.append(group[len(group) // 2])
+    return introselect(medians, len(medians) // 2)
+
+def partition3(arr, lo, hi, pivot):
+    """Three-way partition of arr[lo:hi+1] in place. Returns ``(lt, gt)``
+    with arr[lo:lt] < pivot, arr[lt:gt+1] == pivot and arr[gt+1:hi+1] > pivot.
+
+    Bentley-McIlroy: two inward scans that only swap out-of-place pairs, with
+    keys equal to the pivot parked at both ends and moved to the middle at the
+    end, so already-ordered input stays ordered.
+    """
+    i, j = lo, hi
+    # arr[lo:p] and arr[q+1:hi+1] hold keys equal to the pivot
+    p, q = lo, hi
+    while True:
+        while i <= j and not pivot < arr[i]:
+            if not arr[i] < pivot:
+                arr[p], arr[i] = arr[i], arr[p]
+                p += 1
+            i += 1
+        while i <= j and not arr[j] < pivot:
+            if not pivot < arr[j]:
+                arr[q], arr[j] = arr[j], arr[q]
+                q -= 1
+            j -= 1
+        if i > j:
+            break
+        arr[i], arr[j] = arr[j], arr[i]
+        i += 1
+        j -= 1
+
+    k = min(p - lo, i - p)
+    arr[lo:lo + k], arr[i - k:i] = arr[i - k:i], arr[lo:lo + k]
+    k = min(hi - q, q - j)
+    arr[j + 1:j + 1 + k], arr[hi - k + 1:hi + 1] = arr[hi - k + 1:hi + 1], arr[j + 1:j + 1 + k]
+    return lo + (i - p), hi - (q - j)
+
+def introselect(arr, k):
+    """k-th smallest element (0-based) of ``arr`` in expected O(n).
+
+    Rearranges ``arr`` in place so that everything before position ``k`` is
+    <= ``arr[k]`` and everything after is >=. Quickselect with a
+    median-of-three pivot and a three-way partition; after 2*log2(n) rounds
+    without converging it switches to median-of-medians pivots, which bounds
+    the worst case to O(n).
+    """
+    if not 0 <= k < len(arr):
+        raise IndexError('selection index out of range')
+
+    lo, hi = 0, len(arr) - 1
+    depth = 2 * len(arr).bit_length()
+    while lo < hi:
+        pivot = median_of_three(arr, lo, hi) if depth > 0 else _median_of_medians(arr, lo, hi)
+        depth -= 1
+
+        lt, gt = partition3(arr, lo, hi, pivot)
+        if k < lt:
+            hi = lt - 1
+        elif k > gt:
+            lo = gt + 1
+        else:
+            return arr[k]
+    return arr[k]
+
+def top_k_indices(values, k):
+    """Positions of the ``k`` largest values, O(n log k) with a bounded heap"""
+    if k <= 0:
+        return []
+    return heapq.nlargest(k, range(len(values)), key=values.__getitem__)
+
+class P2Quantile:
+    """Streaming estimate of the ``p`` quantile in O(1) memory (the P-square
+    algorithm of Jain and Chlamtac).
+
+    Five markers track the minimum, the p/2, p and (1+p)/2 quantiles and the
+    maximum; each new observation shifts their positions and moves the
+    heights by piecewise-parabolic interpolation.
+    """
+
+    def __init__(self, p):
+        if not 0 < p < 1:
+            raise ValueError('quantile must be between 0 and 1')
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        self.count += 1
+        q = self.heights
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            cell = 0
+        elif x >= q[4]:
+            q[4] = x
+            cell = 3
+        else:
+            cell = next(i for i in range(1, 5) if x < q[i]) - 1
+
+        n = self.positions
+        for i in range(cell + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def value(self):
+        """Current estimate; exact while fewer than six values were seen"""
+        if not self.heights:
+            return None
+        if self.count <= 5:
+            return self.heights[min(int(self.p * len(self.heights)), len(self.heights) - 1)]
+        return self.heights[2]
+
+def stream_anomalies(records, p=0.9, warmup=5, key=None, estimator=None):
+    """Flag records whose value is above the running ``p`` quantile as they
+    arrive.
+
+    Yields ``(record, estimate, flagged)`` per input; the estimate is taken
+    before the record is added, and nothing is flagged during ``warmup``.
+    Pass ``estimator`` to read the final quantile estimate afterwards.
+    """
+    if estimator is None:
+        estimator = P2Quantile(p)
+    for record in records:
+        value = key(record) if key is not None else record
+        estimate = estimator.value()
+        flagged = estimator.count >= warmup and value > estimate
+        yield record, estimate, flagged
+        estimator.add(value)
@@ -0,0 +1,56 @@
+from collections import Counter
+
+TRACE_LEVELS = ('off', 'summary', 'sampled', 'full')
+
+class StepTracer:
+    """Decides how much of an algorithm's step-by-step trace to keep.
+
+    ``off`` keeps nothing, ``summary`` only counts steps per action,
+    ``sampled`` also records every ``every``-th step and ``full`` records all
+    of them. Algorithms ask ``step(action)`` first and only build the step
+    dict (and copy any data into it) when the answer is True::
+
+        if tracer.step('split'):
+            tracer.record({...})
+    """
+
+    def __init__(self, level='full', every=10):
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level {level}. Available levels: {list(TRACE_LEVELS)}")
+        self.level = level
+        self.every = max(1, int(every))
+        self.enabled = level != 'off'
+        self.count = 0
+        self.actions = Counter()
+        self.steps = []
+
+    def step(self, action='step'):
+        """Count one step; True if its details should be recorded"""
+        if not self.enabled:
+            return False
+        self.count += 1
+        self.actions[action] += 1
+        if self.level == 'full':
+            return True
+        return self.level == 'sampled' and (self.count - 1) % self.every == 0
+
+    def record(self, step):
+        self.steps.append(step)
+
+    def summary(self):
+        return {
+            'level': self.level,
+            'steps': self.count,
+            'recorded': len(self.steps),
+            'actions': dict(self.actions)
+        }
+
+def make_tracer(tracer=None, steps=None):
+    """The tracer an algorithm should use when called without one: record
+    everything, appending to ``steps`` if the caller passed that list"""
+    if tracer is not None:
+        return tracer
+    tracer = StepTracer('full')
+    if steps is not None:
+        tracer.steps = steps
+    return tracer
@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import networkx as nx
 from io import BytesIO
 import base64
+from algorithms import render_service
+from algorithms.drawing import graph_drawing, path_edges
 
 def load_alert_tree(filename):
     with open(filename, 'r') as file:
@@ -107,7 +109,15 @@ def visualize_tree(G, pos, traversal_order=None):
     plt.close()
     return base64.b64encode(img.getvalue()).decode('utf-8')
 
-def analyze_alert_tree(tree_file):
+def alert_tree_drawing(G, pos, traversals):
+    """Client-side counterpart of visualize_tree: the tree with its layout
+    and one highlight per traversal order"""
+    return graph_drawing(G, pos, [{'name': name, 'label': name, 'edges': path_edges(order)}
+                                  for name, order in traversals.items()])
+
+def analyze_alert_tree(tree_file, render=None, drawing=False):
+    render = render_service.resolve(render)
+    
     alert_tree = load_alert_tree(tree_file)
     G, pos = build_tree(alert_tree)
     
@@ -118,11 +128,15 @@ def analyze_alert_tree(tree_file):
         'bfs': traverse_tree(alert_tree, 'bfs')
     }
     
+    # Submit all four figures before waiting on any of them
     images = {}
     for name, order in traversals.items():
-        images[name] = visualize_tree(G, pos, order)
+        images[name] = render(visualize_tree, G, pos, order)
     
-    return {
+    result = {
         'traversals': traversals,
-        'images': images
-    }
\ No newline at end of file
+        'images': {name: image.result() for name, image in images.items()}
+    }
+    if drawing:
+        result['drawing'] = alert_tree_drawing(G, pos, traversals)
+    return result
\ No newline at end of file
@@ -4,6 +4,12 @@ import networkx as nx
 from io import BytesIO
 import base64
 import itertools
+import time
+import numpy as np
+from algorithms.apsp import all_pairs_shortest_paths
+from algorithms.drawing import graph_drawing
+from algorithms.local_search import improve_tour
+from algorithms.tsp_multistart import greedy_order, multi_start_tours, parallel_multi_start
 
 def load_network_graph(filename):
     with open(filename, 'r') as file:
@@ -20,7 +26,7 @@ def build_graph(data):
     
     return G
 
-def brute_force_tsp(graph, nodes_to_visit):
+def brute_force_tsp(graph, nodes_to_visit, paths=None):
     if not nodes_to_visit:
         return [], 0
     
@@ -30,38 +36,152 @@ def brute_force_tsp(graph, nodes_to_visit):
     if not other_nodes:
         return [start_node], 0
     
-    min_path = None
+    if paths is None:
+        paths = all_pairs_shortest_paths(graph)
+    
+    # Hop costs between the targets, looked up once instead of per permutation
+    cost = paths.hop_costs(nodes_to_visit).tolist()
+    
+    min_order = None
     min_distance = float('inf')
     
-    for permutation in itertools.permutations(other_nodes):
-        current_path = [start_node] + list(permutation) + [start_node]
+    for permutation in itertools.permutations(range(1, len(nodes_to_visit))):
         current_distance = 0
-        
-        for i in range(len(current_path) - 1):
-            if graph.has_edge(current_path[i], current_path[i+1]):
-                current_distance += graph.get_edge_data(current_path[i], current_path[i+1])['weight']
-            else:
-                try:
-                    path = nx.shortest_path(graph, current_path[i], current_path[i+1], weight='weight')
-                    current_distance += nx.shortest_path_length(graph, current_path[i], current_path[i+1], weight='weight')
-                except:
-                    current_distance = float('inf')
-                    break
+        previous = 0
+        for i in permutation:
+            current_distance += cost[previous][i]
+            previous = i
+        current_distance += cost[previous][0]
         
         if current_distance < min_distance:
             min_distance = current_distance
-            min_path = current_path
+            min_order = permutation
+    
+    if min_order is None:
+        return None, min_distance
+    
+    min_path = [start_node] + [nodes_to_visit[i] for i in min_order] + [start_node]
+    return min_path, min_distance
+
+def held_karp_memory(num_nodes):
+    """Bytes used by the Held-Karp DP tables for ``num_nodes`` targets"""
+    if num_nodes <= 1:
+        return 0
+    m = num_nodes - 1
+    # float64 cost table + int8 parent table, one row per subset
+    return (1 << m) * m * (8 + 1)
+
+def held_karp_tsp(graph, nodes_to_visit, paths=None):
+    """Exact TSP by bitmask dynamic programming, O(n^2 * 2^n).
+
+    Same contract as ``brute_force_tsp``. ``cost[mask, j]`` is the cheapest
+    way to leave the first node, visit exactly the targets in ``mask`` and
+    stop at target ``j``; subsets are processed one popcount layer at a time
+    with every layer relaxed as a NumPy array operation.
+    """
+    if not nodes_to_visit:
+        return [], 0
     
+    start_node = nodes_to_visit[0]
+    if len(nodes_to_visit) == 1:
+        return [start_node], 0
+    
+    if paths is None:
+        paths = all_pairs_shortest_paths(graph)
+    
+    hop = paths.hop_costs(nodes_to_visit)
+    m = len(nodes_to_visit) - 1
+    full = 1 << m
+    between = hop[1:, 1:]
+    
+    cost = np.full((full, m), np.inf)
+    parent = np.full((full, m), -1, dtype=np.int8)
+    for j in range(m):
+        cost[1 << j, j] = hop[0, j + 1]
+    
+    masks = np.arange(full)
+    popcount = np.zeros(full, dtype=np.int8)
+    for j in range(m):
+        popcount += (masks >> j) & 1
+    
+    for size in range(2, m + 1):
+        layer = masks[popcount == size]
+        for j in range(m):
+            subsets = layer[(layer >> j) & 1 == 1]
+            # cost[prev, k] + hop(k -> j) for every predecessor k
+            candidates = cost[subsets ^ (1 << j)] + between[:, j]
+            best = np.argmin(candidates, axis=1)
+            cost[subsets, j] = candidates[np.arange(len(subsets)), best]
+            parent[subsets, j] = best
+    
+    closing = cost[full - 1] + hop[1:, 0]
+    last = int(np.argmin(closing))
+    min_distance = closing[last].item()
+    if not np.isfinite(min_distance):
+        return None, min_distance
+    
+    order = []
+    mask = full - 1
+    j = last
+    while j != -1:
+        order.append(j)
+        mask, j = mask ^ (1 << j), int(parent[mask, j])
+    order.reverse()
+    
+    min_path = [start_node] + [nodes_to_visit[j + 1] for j in order] + [start_node]
     return min_path, min_distance
 
-def optimize_hacker_route(graph_data, nodes_to_visit):
+def nearest_neighbor_order(paths, start, nodes):
+    """Greedy visiting order from ``start``: prefer the closest directly linked
+    target, fall back to the closest target by shortest route. Stops early
+    if no unvisited target is reachable."""
+    targets = [start] + [node for node in dict.fromkeys(nodes) if node != start]
+    direct, dist = paths.submatrices(targets)
+    return [targets[i] for i in greedy_order(direct, dist, 0)]
+
+NEGATIVE_CYCLE_MESSAGE = 'Route optimization needs non-negative latencies: a negative edge forms a negative cycle'
+
+def tour_path(paths, order):
+    """Reported path and distance for a visiting order: every hop uses the
+    direct edge when there is one, and the way back to the start is
+    expanded along the shortest route when it is not a direct edge"""
+    start, current = order[0], order[-1]
+    path = list(order)
+    total_distance = sum(paths.hop_cost(u, v) for u, v in zip(order[:-1], order[1:]))
+    
+    # Return to start if possible
+    if paths.has_edge(current, start):
+        path.append(start)
+        total_distance += paths.hop_cost(current, start)
+    elif len(path) > 1:
+        return_path = paths.path(current, start)
+        if return_path is not None:
+            path.extend(return_path[1:])
+            total_distance += paths.distance(current, start)
+    
+    return path, total_distance
+
+def refine_tour(paths, order, max_iterations=100, time_limit=None):
+    """Local-search stage: 2-opt / Or-opt over the targets' hop costs.
+
+    Returns the refined visiting order and the search statistics.
+    """
+    cost = paths.hop_costs(order)
+    refined, _, stats = improve_tour(cost, range(len(order)), max_iterations, time_limit)
+    return [order[i] for i in refined], stats
+
+def optimize_hacker_route(graph_data, nodes_to_visit, G=None, paths=None,
+                          exact_max_nodes=18, exact_memory_limit=256 * 2**20,
+                          local_search_iterations=100, local_search_time=0.2,
+                          parallel_workers=1, parallel_min_nodes=64):
     if not nodes_to_visit:
         return {
             'optimal_path': {'path': [], 'total_distance': 0},
             'heuristic_path': {'path': [], 'total_distance': 0}
         }
 
-    G = build_graph(graph_data)
+    if G is None:
+        G = build_graph(graph_data)
     
     # Convert node IDs to integers if they're strings
     try:
@@ -80,90 +200,64 @@ def optimize_hacker_route(graph_data, nodes_to_visit):
             'heuristic_path': {'path': None, 'total_distance': float('inf')}
         }
     
-    # Limit brute-force to small graphs (n <= 8 for performance)
-    if len(valid_nodes) <= 8:
-        optimal_path, optimal_distance = brute_force_tsp(G, valid_nodes)
+    if paths is None:
+        paths = all_pairs_shortest_paths(G)
+    if paths.negative_cycle:
+        raise ValueError(NEGATIVE_CYCLE_MESSAGE)
+    
+    # Held-Karp is exact but exponential, only run it while the DP tables fit
+    exact_memory = held_karp_memory(len(valid_nodes))
+    if len(valid_nodes) <= exact_max_nodes and exact_memory <= exact_memory_limit:
+        optimal_path, optimal_distance = held_karp_tsp(G, valid_nodes, paths)
+        exact_engine = 'held_karp'
     else:
         optimal_path, optimal_distance = None, float('inf')
+        exact_engine = None
     
-    # Nearest neighbor heuristic with fallback to shortest path
-    def nearest_neighbor(start, nodes):
-        unvisited = set(nodes)
-        unvisited.remove(start)
-        path = [start]
-        current = start
-        total_distance = 0
-        
-        while unvisited:
-            nearest = None
-            min_dist = float('inf')
-            
-            for node in unvisited:
-                if G.has_edge(current, node):
-                    dist = G.get_edge_data(current, node)['weight']
-                    if dist < min_dist:
-                        min_dist = dist
-                        nearest = node
-            
-            if nearest is None:
-                # No direct path, find shortest path to any unvisited node
-                try:
-                    paths = nx.shortest_path(G, current, weight='weight')
-                    for node in unvisited:
-                        if node in paths:
-                            dist = nx.shortest_path_length(G, current, node, weight='weight')
-                            if dist < min_dist:
-                                min_dist = dist
-                                nearest = node
-                except:
-                    break
-            
-            if nearest is None:
-                break  # Can't reach any unvisited nodes
-            
-            path.append(nearest)
-            total_distance += min_dist
-            current = nearest
-            unvisited.remove(nearest)
-        
-        # Return to start if possible
-        if G.has_edge(current, start):
-            path.append(start)
-            total_distance += G.get_edge_data(current, start)['weight']
-        elif len(path) > 1:
-            try:
-                return_path = nx.shortest_path(G, current, start, weight='weight')
-                path.extend(return_path[1:])
-                total_distance += nx.shortest_path_length(G, current, start, weight='weight')
-            except:
-                pass
-        
-        return path, total_distance
-    
-    # Try nearest neighbor from each starting point
-    nn_path = None
-    nn_distance = float('inf')
+    # Try nearest neighbor from each starting point, refining every complete
+    # greedy tour with local search while the time budget lasts
+    targets = list(dict.fromkeys(valid_nodes))
+    direct, dist = paths.submatrices(targets)
+    if parallel_workers != 1 and len(targets) >= parallel_min_nodes:
+        tours = parallel_multi_start(direct, dist, range(len(targets)), local_search_iterations,
+                                     local_search_time, workers=parallel_workers)
+    else:
+        deadline = time.time() + local_search_time if local_search_time is not None else None
+        tours = multi_start_tours(direct, dist, range(len(targets)), local_search_iterations, deadline)
     
-    for start in valid_nodes:
-        path, dist = nearest_neighbor(start, valid_nodes.copy())
+    nn_path, nn_distance = tour_path(paths, [targets[i] for i in tours['raw'][1]])
+    raw_distance = nn_distance
+    improvement = None
+    if tours['refined'] is not None:
+        path, dist = tour_path(paths, [targets[i] for i in tours['refined'][1]])
         if dist < nn_distance:
             nn_path = path
             nn_distance = dist
+        improvement = dict(tours['stats'], distance=raw_distance - nn_distance,
+                           percent=100 * (raw_distance - nn_distance) / raw_distance if raw_distance else 0)
     
     return {
         'optimal_path': {
             'path': optimal_path if optimal_path else [],
-            'total_distance': optimal_distance
+            'total_distance': optimal_distance,
+            'engine': exact_engine,
+            'memory_bytes': exact_memory
         },
         'heuristic_path': {
             'path': nn_path if nn_path else [],
-            'total_distance': nn_distance
+            'total_distance': nn_distance,
+            'raw_distance': raw_distance,
+            'improvement': improvement
         }
     }
 
-def visualize_tsp_solution(graph_data, solution):
-    G = build_graph(graph_data)
-    pos = nx.spring_layout(G, seed=42)
+def visualize_tsp_solution(graph_data, solution, G=None, paths=None, pos=None):
+    if G is None:
+        G = build_graph(graph_data)
+    if paths is None:
+        paths = all_pairs_shortest_paths(G)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42)
     
     plt.figure(figsize=(14, 10))
     
@@ -185,16 +279,8 @@ def visualize_tsp_solution(graph_data, solution):
     # Highlight optimal path if it exists and is valid
     if solution['optimal_path']['path'] and len(solution['optimal_path']['path']) > 1:
         try:
-            edges = []
-            for i in range(len(solution['optimal_path']['path']) - 1):
-                u = solution['optimal_path']['path'][i]
-                v = solution['optimal_path']['path'][i+1]
-                if G.has_edge(u, v):
-                    edges.append((u, v))
-                else:
-                    # Draw the full path if direct edges don't exist
-                    path = nx.shortest_path(G, u, v, weight='weight')
-                    edges.extend(list(zip(path[:-1], path[1:])))
+            # Draw the full route where direct edges don't exist
+            edges = paths.expand(solution['optimal_path']['path'])
             
             if edges:
                 nx.draw_networkx_edges(G, pos, edgelist=edges, 
@@ -206,16 +292,8 @@ def visualize_tsp_solution(graph_data, solution):
     # Highlight heuristic path if it exists and is valid
     if solution['heuristic_path']['path'] and len(solution['heuristic_path']['path']) > 1:
         try:
-            edges = []
-            for i in range(len(solution['heuristic_path']['path']) - 1):
-                u = solution['heuristic_path']['path'][i]
-                v = solution['heuristic_path']['path'][i+1]
-                if G.has_edge(u, v):
-                    edges.append((u, v))
-                else:
-                    # Draw the full path if direct edges don't exist
-                    path = nx.shortest_path(G, u, v, weight='weight')
-                    edges.extend(list(zip(path[:-1], path[1:])))
+            # Draw the full route where direct edges don't exist
+            edges = paths.expand(solution['heuristic_path']['path'])
             
             if edges:
                 nx.draw_networkx_edges(G, pos, edgelist=edges, 
@@ -243,4 +321,25 @@ def visualize_tsp_solution(graph_data, solution):
     plt.savefig(img, format='png', bbox_inches='tight', dpi=100)
     img.seek(0)
     plt.close()
-    return base64.b64encode(img.getvalue()).decode('utf-8')
\ No newline at end of file
+    return base64.b64encode(img.getvalue()).decode('utf-8')
+
+def tsp_solution_drawing(graph_data, solution, G=None, paths=None, pos=None):
+    """Client-side counterpart of visualize_tsp_solution"""
+    if G is None:
+        G = build_graph(graph_data)
+    if paths is None:
+        paths = all_pairs_shortest_paths(G)
+    if pos is None:
+        pos = nx.spring_layout(G, seed=42)
+    
+    highlights = []
+    for name, key in (('optimal', 'optimal_path'), ('heuristic', 'heuristic_path')):
+        route = solution[key]['path']
+        try:
+            # Same full-route expansion as the figure
+            edges = [list(edge) for edge in paths.expand(route)] if route and len(route) > 1 else []
+        except ValueError:
+            edges = []
+        highlights.append({'name': name, 'label': f"{name.capitalize()} ({solution[key]['total_distance']}ms)",
+                           'edges': edges})
+    return graph_drawing(G, pos, highlights)
@@ -0,0 +1,115 @@
+import queue
+import threading
+import time
+import numpy as np
+from algorithms.tsp import (held_karp_memory, held_karp_tsp, nearest_neighbor_order,
+                            refine_tour, tour_path)
+
+# Rough Held-Karp cost per (n^2 * 2^(n-1)) unit, used to decide whether the
+# exact solver still fits in the remaining budget
+HELD_KARP_SECONDS_PER_UNIT = 10e-9
+
+def tour_lower_bound(cost):
+    """Half the sum of every node's two cheapest hops; a valid lower bound on
+    any closed tour for symmetric costs"""
+    cost = np.array(cost, dtype=float)
+    n = len(cost)
+    if n <= 1:
+        return 0.0
+    if n == 2:
+        return (cost[0, 1] + cost[1, 0]).item()
+
+    np.fill_diagonal(cost, np.inf)
+    cheapest = np.partition(cost, 1, axis=1)[:, :2]
+    return (cheapest.sum() / 2).item()
+
+def held_karp_estimate(num_nodes):
+    """Expected Held-Karp running time in seconds"""
+    return HELD_KARP_SECONDS_PER_UNIT * num_nodes ** 2 * 2 ** max(num_nodes - 1, 0)
+
+def anytime_tsp(paths, nodes, time_budget, exact_max_nodes=18, exact_memory_limit=256 * 2**20):
+    """Generator of progressively better tours within ``time_budget`` seconds.
+
+    Yields ``incumbent`` events whenever a better tour is found (greedy
+    multi-start first, then local search on each greedy tour, then the exact
+    Held-Karp tour if it fits the remaining budget), and a single ``final``
+    event with the best tour and a lower bound on the optimum.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+
+    def elapsed_ms():
+        return (time.perf_counter() - started) * 1000
+
+    targets = list(dict.fromkeys(nodes))
+    best = {'path': None, 'total_distance': float('inf')}
+
+    def offer(path, distance, source):
+        if distance < best['total_distance']:
+            best.update(path=path, total_distance=distance)
+            return {'event': 'incumbent', 'source': source, 'path': path,
+                    'total_distance': distance, 'elapsed_ms': elapsed_ms()}
+        return None
+
+    lower_bound = tour_lower_bound(paths.hop_costs(targets)) if targets else 0.0
+    optimal = False
+
+    # Greedy tours from every start, the first one answers within milliseconds
+    orders = []
+    for start in targets:
+        order = nearest_neighbor_order(paths, start, targets)
+        path, distance = tour_path(paths, order)
+        if len(order) == len(targets) and distance < float('inf'):
+            orders.append((distance, order))
+        event = offer(path, distance, 'nearest_neighbor')
+        if event:
+            yield event
+        if time.perf_counter() > deadline:
+            break
+
+    # Local search, most promising greedy tours first
+    for _, order in sorted(orders, key=lambda item: item[0]):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        refined, _ = refine_tour(paths, order, max_iterations=1000, time_limit=remaining)
+        event = offer(*tour_path(paths, refined), 'local_search')
+        if event:
+            yield event
+
+    # Exact answer if it fits both the memory and the remaining time
+    remaining = deadline - time.perf_counter()
+    if (targets and len(targets) <= exact_max_nodes
+            and held_karp_memory(len(targets)) <= exact_memory_limit
+            and held_karp_estimate(len(targets)) <= remaining):
+        path, distance = held_karp_tsp(None, targets, paths)
+        event = offer(path, distance, 'held_karp')
+        if event:
+            yield event
+        lower_bound = distance
+        optimal = True
+
+    yield {'event': 'final', 'path': best['path'], 'total_distance': best['total_distance'],
+           'lower_bound': lower_bound, 'optimal': optimal, 'elapsed_ms': elapsed_ms()}
+
+def run_in_worker(events):
+    """Drive an event generator on a background thread and yield its events
+    as they are produced"""
+    channel = queue.Queue()
+    done = object()
+
+    def worker():
+        try:
+            for event in events:
+                channel.put(event)
+        except Exception as e:
+            channel.put({'event': 'error', 'message': str(e)})
+        finally:
+            channel.put(done)
+
+    threading.Thread(target=worker, daemon=True).start()
+    while True:
+        event = channel.get()
+        if event is done:
+            return
+        yield event
@@ -0,0 +1,122 @@
+import math
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from algorithms import pools
+from algorithms.local_search import improve_tour
+
+def greedy_order(direct, dist, start):
+    """Nearest-neighbour visiting order over target-indexed matrices.
+
+    Prefers the closest directly linked target (``direct``), falls back to
+    the closest target by shortest route (``dist``) and stops early if no
+    unvisited target is reachable.
+    """
+    unvisited = [i for i in range(len(direct)) if i != start]
+    order = [start]
+    current = start
+
+    while unvisited:
+        costs = direct[current, unvisited]
+        if not np.isfinite(costs).any():
+            costs = dist[current, unvisited]
+
+        best = int(np.argmin(costs))
+        if not np.isfinite(costs[best]):
+            break
+
+        current = unvisited.pop(best)
+        order.append(current)
+
+    return order
+
+def reported_length(hop, order):
+    """Distance as ``tsp.tour_path`` reports it: the way back to the start is
+    only added when it exists"""
+    length = sum(hop[u][v] for u, v in zip(order[:-1], order[1:]))
+    closing = hop[order[-1]][order[0]]
+    return length + closing if closing < float('inf') else length
+
+def multi_start_tours(direct, dist, starts, max_iterations=100, deadline=None):
+    """Greedy tour from every start index, each complete tour refined by
+    local search until the wall-clock ``deadline``.
+
+    Returns ``{'raw': (length, order), 'refined': (length, order) or None,
+    'stats': {...}}`` with the best tour of each kind.
+    """
+    hop = np.where(np.isfinite(direct), direct, dist).tolist()
+    best_raw = None
+    best_refined = None
+    stats = {'iterations': 0, 'two_opt_moves': 0, 'or_opt_moves': 0, 'refined_tours': 0}
+
+    for start in starts:
+        order = greedy_order(direct, dist, start)
+        length = reported_length(hop, order)
+        if best_raw is None or length < best_raw[0]:
+            best_raw = (length, order)
+
+        if not max_iterations or len(order) != len(direct) or length == float('inf'):
+            continue
+        remaining = deadline - time.time() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            continue
+
+        order, length, tour_stats = improve_tour(hop, order, max_iterations, remaining)
+        for key in ('iterations', 'two_opt_moves', 'or_opt_moves'):
+            stats[key] += tour_stats[key]
+        stats['refined_tours'] += 1
+        if best_refined is None or length < best_refined[0]:
+            best_refined = (length, order)
+
+    return {'raw': best_raw, 'refined': best_refined, 'stats': stats}
+
+def merge_results(results):
+    """Reduce per-chunk ``multi_start_tours`` results to the overall best"""
+    merged = {'raw': None, 'refined': None,
+              'stats': {'iterations': 0, 'two_opt_moves': 0, 'or_opt_moves': 0, 'refined_tours': 0}}
+    for result in results:
+        for kind in ('raw', 'refined'):
+            if result[kind] is not None and (merged[kind] is None or result[kind][0] < merged[kind][0]):
+                merged[kind] = result[kind]
+        for key, value in result['stats'].items():
+            merged['stats'][key] += value
+    return merged
+
+def _run_chunk(shm_name, n, starts, max_iterations, deadline):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        matrices = np.ndarray((2, n, n), dtype=np.float64, buffer=shm.buf)
+        result = multi_start_tours(matrices[0], matrices[1], starts, max_iterations, deadline)
+        del matrices
+        return result
+    finally:
+        shm.close()
+
+def parallel_multi_start(direct, dist, starts, max_iterations=100, time_budget=None, workers=None):
+    """``multi_start_tours`` fanned out over a process pool.
+
+    The two matrices are copied once into shared memory and every worker maps
+    them read-only; each task handles a chunk of start indices. The
+    ``time_budget`` (seconds) starts once the workers are running, so
+    spawning them on the first call does not use it up.
+    """
+    workers = pools.default_workers(workers)
+    n = len(direct)
+    starts = list(starts)
+    executor = pools.get_pool('compute', workers, warm=True)
+    deadline = time.time() + time_budget if time_budget is not None else None
+
+    shm = shared_memory.SharedMemory(create=True, size=max(2 * n * n * 8, 1))
+    try:
+        matrices = np.ndarray((2, n, n), dtype=np.float64, buffer=shm.buf)
+        matrices[0] = direct
+        matrices[1] = dist
+        del matrices
+
+        chunk = max(1, math.ceil(len(starts) / (workers * 4)))
+        futures = [executor.submit(_run_chunk, shm.name, n, starts[i:i + chunk], max_iterations, deadline)
+                   for i in range(0, len(starts), chunk)]
+        return merge_results(future.result() for future in futures)
+    finally:
+        shm.close()
+        shm.unlink()
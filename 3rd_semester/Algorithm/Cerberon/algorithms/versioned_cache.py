@@ -0,0 +1,52 @@
+import hashlib
+import os
+import threading
+
+def file_signature(filename):
+    """Cheap change detector: modification time and size"""
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+def file_digest(filename, chunk_size=1 << 20):
+    """SHA-1 of the file contents, read in chunks"""
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class VersionedFileCache:
+    """Load a data file once per process and rebuild it only when it changes.
+
+    The file is re-stat'ed on every lookup. When the mtime/size signature
+    changes the contents are hashed, and ``loader(filename, version)`` is only
+    called again if the hash differs from the cached version.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, filename):
+        key = os.path.abspath(filename)
+        signature = file_signature(key)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[2]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                return entry[2]
+
+            version = file_digest(key)
+            if entry is not None and entry[1] == version:
+                # Touched but not modified, keep the loaded value
+                value = entry[2]
+            else:
+                value = self._loader(key, version)
+
+            self._entries[key] = (signature, version, value)
+            return value
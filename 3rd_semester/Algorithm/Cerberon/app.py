@@ -1,17 +1,94 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, abort, render_template, request, jsonify, stream_with_context
 import os
-from algorithms.binary_search import load_passwords, compare_search_algorithms
+import json
+from algorithms.binary_search import compare_search_algorithms, check_candidates
+from algorithms.password_index import get_password_index
+from algorithms.log_store import get_log_store, parse_clock, parse_severities
 from algorithms.merge_sort import analyze_logs
 from algorithms.quick_sort import detect_anomalies
 from algorithms.tree_traversal import analyze_alert_tree
-from algorithms.bfs_dfs import detect_phishing_route, visualize_graph_paths
-from algorithms.dijkstra import find_secure_paths, visualize_secure_paths
-from algorithms.bellman_ford import detect_suspicious_delays, visualize_suspicious_delays
-from algorithms.tsp import optimize_hacker_route, visualize_tsp_solution
-import json
+from algorithms.bfs_dfs import detect_phishing_route, visualize_graph_paths, graph_paths_drawing
+from algorithms.dijkstra import (find_secure_paths, visualize_secure_paths, secure_paths_drawing,
+                                 one_to_all_distances, distance_matrix)
+from algorithms.bellman_ford import detect_suspicious_delays, visualize_suspicious_delays, suspicious_delays_drawing
+from algorithms.tsp import (NEGATIVE_CYCLE_MESSAGE, optimize_hacker_route, visualize_tsp_solution,
+                            tsp_solution_drawing)
+from algorithms.tsp_anytime import anytime_tsp, run_in_worker
+from algorithms.graph_store import get_graph_snapshot
+from algorithms.benchmark import BENCHMARKS, run_benchmarks
+from algorithms.step_trace import TRACE_LEVELS
+from algorithms.layout_cache import get_layout
+from algorithms import image_cache, render_service
 
 app = Flask(__name__)
 app.config.from_pyfile('config.py')
+render_service.configure(app.config['RENDER_WORKERS'])
+image_cache.configure(app.config['IMAGE_CACHE_FOLDER'], app.config['IMAGE_CACHE_ENTRIES'],
+                     app.config['IMAGE_CACHE_DISK_ENTRIES'])
+
+def network_graph():
+    return get_graph_snapshot(os.path.join(app.config['DATA_FOLDER'], 'network_graph.json'))
+
+def directed_graph(snapshot):
+    # engine=csr runs the traversal on the array-backed graph
+    if request.form.get('engine', app.config['GRAPH_ENGINE']) == 'csr':
+        return snapshot.csr
+    return snapshot.directed
+
+def graph_layout(snapshot, G):
+    return get_layout(G, snapshot.version, app.config['GRAPH_LAYOUT'], app.config['LAYOUT_CACHE_FOLDER'])
+
+DRAWING_MIMETYPE = 'application/vnd.cerberon.drawing+json'
+
+def wants_drawing():
+    # ?format=drawing or Accept: application/vnd.cerberon.drawing+json skips matplotlib entirely.
+    # The graph views and the alert tree return a 'drawing' payload (nodes with positions, edges,
+    # highlights) instead; the sort and search views only have their figures and return no image.
+    return request.args.get('format') == 'drawing' or request.accept_mimetypes.best == DRAWING_MIMETYPE
+
+def analyzer_render():
+    return False if wants_drawing() else image_cache.render
+
+def trace_options():
+    # ?trace=off|summary|sampled|full picks how much of each step trace is kept
+    trace = request.values.get('trace', app.config['TRACE_LEVEL'])
+    if trace not in TRACE_LEVELS:
+        raise ValueError(f"Unknown trace level {trace}. Available levels: {list(TRACE_LEVELS)}")
+    try:
+        trace_every = int(request.values.get('trace_every', app.config['TRACE_SAMPLE_EVERY']))
+    except ValueError:
+        raise ValueError('trace_every must be a positive integer') from None
+    if trace_every < 1:
+        raise ValueError('trace_every must be a positive integer')
+    return {'trace': trace, 'trace_every': trace_every}
+
+def limit_arg(maximum):
+    # ?limit= clamped to [0, maximum], the maximum when absent
+    try:
+        limit = int(request.args.get('limit', maximum))
+    except ValueError:
+        raise ValueError('limit must be an integer') from None
+    return min(max(limit, 0), maximum)
+
+def render_graph(snapshot, func, graph_data, drawn, **kwargs):
+    # The figure is fully determined by what is drawn on it (the paths, analysis or solution
+    # returned in the same response), the graph version and the layout. Keying on the result
+    # rather than the form keeps config limits and time-budgeted heuristics in the key too.
+    key = (request.path, drawn, snapshot.version, app.config['GRAPH_LAYOUT'])
+    return image_cache.render(func, graph_data, drawn, cache_key=key, **kwargs)
+
+def parse_node_selection(value, graph_data):
+    # Comma separated node ids and/or group names, e.g. "user" or "1,8,server"
+    selected = []
+    for token in value.split(','):
+        token = token.strip()
+        if not token:
+            continue
+        if token.lstrip('-').isdigit():
+            selected.append(int(token))
+        else:
+            selected.extend(node['id'] for node in graph_data['nodes'] if node['group'] == token)
+    return list(dict.fromkeys(selected))
 
 @app.route('/')
 def index():
@@ -20,54 +97,148 @@ def index():
 # Binary Search - Password Attack Simulator
 @app.route('/password_attack', methods=['GET', 'POST'])
 def password_attack():
-    passwords = load_passwords(os.path.join(app.config['DATA_FOLDER'], 'passwords.txt'))
-    sorted_passwords = sorted(passwords)
+    passwords = get_password_index(os.path.join(app.config['DATA_FOLDER'], 'passwords.txt'),
+                                   app.config['PASSWORD_INDEX_FOLDER'])
     
     if request.method == 'POST':
         target = request.form.get('target', 'admin')
-        result = compare_search_algorithms(sorted_passwords, target)
+        try:
+            options = trace_options()
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)})
+        result = compare_search_algorithms(passwords, target, render=analyzer_render(), **options)
         return jsonify(result)
     
+    try:
+        limit = limit_arg(app.config['PASSWORD_PREVIEW_LIMIT'])
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     return jsonify({
-        'passwords': sorted_passwords,
+        'passwords': passwords[:limit],
+        'total': len(passwords),
         'default_target': 'admin'
     })
 
+# Binary Search - Batch membership against the wordlist
+@app.route('/password_attack/batch', methods=['POST'])
+def password_attack_batch():
+    passwords = get_password_index(os.path.join(app.config['DATA_FOLDER'], 'passwords.txt'),
+                                   app.config['PASSWORD_INDEX_FOLDER'])
+    
+    # An uploaded file, a JSON list or newline separated form text
+    if 'candidates' in request.files:
+        candidates = request.files['candidates'].read().decode('utf-8', errors='replace').splitlines()
+    elif request.is_json:
+        # Either a bare list or {"candidates": [...]}
+        data = request.get_json(silent=True)
+        candidates = data.get('candidates', []) if isinstance(data, dict) else data
+        if not isinstance(candidates, list):
+            return jsonify({
+                'status': 'error',
+                'message': "Expected a JSON list of candidates or {'candidates': [...]}"
+            })
+    else:
+        candidates = request.form.get('candidates', '').splitlines()
+    candidates = [str(candidate).strip() for candidate in candidates if str(candidate).strip()]
+    
+    if len(candidates) > app.config['PASSWORD_BATCH_LIMIT']:
+        return jsonify({
+            'status': 'error',
+            'message': f"At most {app.config['PASSWORD_BATCH_LIMIT']} candidates per request"
+        })
+    
+    return jsonify(check_candidates(passwords, candidates))
+
 # Merge Sort - Log Analyzer
 @app.route('/log_analyzer', methods=['GET'])
 def log_analyzer():
-    result = analyze_logs(os.path.join(app.config['DATA_FOLDER'], 'log_entries.txt'))
+    try:
+        result = analyze_logs(os.path.join(app.config['DATA_FOLDER'], app.config['LOG_FILE']),
+                              render=analyzer_render(), **trace_options(),
+                              mode=request.args.get('mode', app.config['LOG_SORT_MODE']),
+                              output_folder=app.config['LOG_SORT_FOLDER'],
+                              chunk_size=app.config['LOG_SORT_CHUNK_SIZE'],
+                              engine=request.args.get('engine', app.config['LOG_SORT_ENGINE']),
+                              workers=app.config['SORT_PARALLEL_WORKERS'],
+                              parallel_min_size=app.config['SORT_PARALLEL_MIN_SIZE'],
+                              # ?compare=1 times every engine, not just the selected one
+                              compare=request.args.get('compare') == '1')
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)})
     return jsonify(result)
 
 # Quick Sort - Anomaly Detection
 @app.route('/anomaly_detection', methods=['GET'])
 def anomaly_detection():
-    result = detect_anomalies(os.path.join(app.config['DATA_FOLDER'], 'log_entries.txt'))
+    try:
+        result = detect_anomalies(os.path.join(app.config['DATA_FOLDER'], app.config['LOG_FILE']),
+                                  render=analyzer_render(), **trace_options(),
+                                  mode=request.args.get('mode', app.config['ANOMALY_MODE']),
+                                  percentile=float(request.args.get('percentile', app.config['ANOMALY_PERCENTILE'])),
+                                  engine=request.args.get('engine', app.config['ANOMALY_SORT_ENGINE']))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)})
     return jsonify(result)
 
+# Log Store - indexed queries over the parsed log
+@app.route('/logs', methods=['GET'])
+def logs_summary():
+    store = get_log_store(os.path.join(app.config['DATA_FOLDER'], app.config['LOG_FILE']))
+    return jsonify(store.summary())
+
+@app.route('/logs/query', methods=['GET'])
+def logs_query():
+    store = get_log_store(os.path.join(app.config['DATA_FOLDER'], app.config['LOG_FILE']))
+    try:
+        start = parse_clock(request.args['start']) if request.args.get('start') else None
+        end = parse_clock(request.args['end']) if request.args.get('end') else None
+        # "ERROR+" must be sent as ERROR%2B, min_severity=ERROR says the same
+        severities = parse_severities(request.args.get('severity', ''))
+        if request.args.get('min_severity'):
+            severities = (severities or set()) | parse_severities(request.args['min_severity'] + '+')
+        limit = limit_arg(app.config['LOG_QUERY_LIMIT'])
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    ids, strategy = store.query(start, end, severities)
+    return jsonify({
+        'status': 'success',
+        'version': store.version,
+        'total': len(ids),
+        'strategy': strategy,
+        'records': [store.record(i) for i in ids[:limit]]
+    })
+
 # Tree Traversal - Alert Tracer
 @app.route('/alert_tracer', methods=['GET'])
 def alert_tracer():
-    result = analyze_alert_tree(os.path.join(app.config['DATA_FOLDER'], 'alert_tree.json'))
+    result = analyze_alert_tree(os.path.join(app.config['DATA_FOLDER'], 'alert_tree.json'), render=analyzer_render(),
+                                drawing=wants_drawing())
     return jsonify(result)
 
 # BFS/DFS - Phishing Tracker
 @app.route('/phishing_tracker', methods=['GET', 'POST'])
 def phishing_tracker():
-    with open(os.path.join(app.config['DATA_FOLDER'], 'network_graph.json')) as f:
-        graph_data = json.load(f)
+    snapshot = network_graph()
+    graph_data = snapshot.data
     
     if request.method == 'POST':
         start = int(request.form.get('start', 1))
         end = int(request.form.get('end', 4))
-        paths = detect_phishing_route(graph_data, start, end)
-        image = visualize_graph_paths(graph_data, {
+        paths = detect_phishing_route(graph_data, start, end, G=directed_graph(snapshot))
+        if wants_drawing():
+            return jsonify({
+                'paths': paths,
+                'drawing': graph_paths_drawing(graph_data, {'BFS': paths['bfs_path'], 'DFS': paths['dfs_path']},
+                                               G=snapshot.directed, pos=graph_layout(snapshot, snapshot.directed))
+            })
+        image = render_graph(snapshot, visualize_graph_paths, graph_data, {
             'BFS': paths['bfs_path'],
             'DFS': paths['dfs_path']
-        })
+        }, G=snapshot.directed, pos=graph_layout(snapshot, snapshot.directed))
         return jsonify({
             'paths': paths,
-            'image': image
+            'image': image.result()
         })
     
     return jsonify({
@@ -79,17 +250,24 @@ def phishing_tracker():
 # Dijkstra - Secure Path Finder
 @app.route('/path_finder', methods=['GET', 'POST'])
 def path_finder():
-    with open(os.path.join(app.config['DATA_FOLDER'], 'network_graph.json')) as f:
-        graph_data = json.load(f)
+    snapshot = network_graph()
+    graph_data = snapshot.data
     
     if request.method == 'POST':
         start = int(request.form.get('start', 1))
         end = int(request.form.get('end', 5))
-        paths = find_secure_paths(graph_data, start, end)
-        image = visualize_secure_paths(graph_data, paths)
+        paths = find_secure_paths(graph_data, start, end, G=directed_graph(snapshot))
+        if wants_drawing():
+            return jsonify({
+                'paths': paths,
+                'drawing': secure_paths_drawing(graph_data, paths, G=snapshot.directed,
+                                                pos=graph_layout(snapshot, snapshot.directed))
+            })
+        image = render_graph(snapshot, visualize_secure_paths, graph_data, paths, G=snapshot.directed,
+                             pos=graph_layout(snapshot, snapshot.directed))
         return jsonify({
             'paths': paths,
-            'image': image
+            'image': image.result()
         })
     
     return jsonify({
@@ -98,19 +276,43 @@ def path_finder():
         'default_end': 5
     })
 
+# Dijkstra - One-to-all latencies, null for nodes that cannot be reached
+@app.route('/path_finder/distances', methods=['POST'])
+def path_finder_distances():
+    snapshot = network_graph()
+    start = int(request.form.get('start', 1))
+    return jsonify(one_to_all_distances(snapshot.data, start, G=directed_graph(snapshot)))
+
+# Dijkstra - Many-to-many latency matrix, null where a target cannot be reached
+@app.route('/path_finder/matrix', methods=['POST'])
+def path_finder_matrix():
+    snapshot = network_graph()
+    sources = parse_node_selection(request.form.get('sources', 'user'), snapshot.data)
+    targets = parse_node_selection(request.form.get('targets', 'server'), snapshot.data)
+    return jsonify(distance_matrix(snapshot.data, sources, targets, G=directed_graph(snapshot)))
+
 # Bellman-Ford - Suspicious Delay Detection
 @app.route('/delay_detection', methods=['GET', 'POST'])
 def delay_detection():
-    with open(os.path.join(app.config['DATA_FOLDER'], 'network_graph.json')) as f:
-        graph_data = json.load(f)
+    snapshot = network_graph()
+    graph_data = snapshot.data
     
     if request.method == 'POST':
         start = int(request.form.get('start', 1))
-        analysis = detect_suspicious_delays(graph_data, start)
-        image = visualize_suspicious_delays(graph_data, analysis)
+        engine = request.form.get('bf_engine', app.config['BELLMAN_FORD_ENGINE'])
+        analysis = detect_suspicious_delays(graph_data, start, G=directed_graph(snapshot), engine=engine,
+                                            max_cycles=app.config['BELLMAN_FORD_MAX_CYCLES'])
+        if wants_drawing():
+            return jsonify({
+                'analysis': analysis,
+                'drawing': suspicious_delays_drawing(graph_data, analysis, G=snapshot.directed,
+                                                     pos=graph_layout(snapshot, snapshot.directed))
+            })
+        image = render_graph(snapshot, visualize_suspicious_delays, graph_data, analysis, G=snapshot.directed,
+                             pos=graph_layout(snapshot, snapshot.directed))
         return jsonify({
             'analysis': analysis,
-            'image': image
+            'image': image.result()
         })
     
     return jsonify({
@@ -121,16 +323,34 @@ def delay_detection():
 # TSP - Hacker Movement Optimizer
 @app.route('/hacker_optimizer', methods=['GET', 'POST'])
 def hacker_optimizer():
-    with open(os.path.join(app.config['DATA_FOLDER'], 'network_graph.json')) as f:
-        graph_data = json.load(f)
+    snapshot = network_graph()
+    graph_data = snapshot.data
     
     if request.method == 'POST':
         nodes = list(map(int, request.form.get('nodes', '1,2,3,4').split(',')))
-        solution = optimize_hacker_route(graph_data, nodes)
-        image = visualize_tsp_solution(graph_data, solution)
+        try:
+            solution = optimize_hacker_route(graph_data, nodes, G=snapshot.undirected, paths=snapshot.all_pairs,
+                                             exact_max_nodes=app.config['TSP_EXACT_MAX_NODES'],
+                                             exact_memory_limit=app.config['TSP_EXACT_MEMORY_MB'] * 2**20,
+                                             local_search_iterations=int(request.form.get(
+                                                 'local_search_iterations', app.config['TSP_LOCAL_SEARCH_ITERATIONS'])),
+                                             local_search_time=float(request.form.get(
+                                                 'local_search_ms', app.config['TSP_LOCAL_SEARCH_MS'])) / 1000,
+                                             parallel_workers=app.config['TSP_PARALLEL_WORKERS'],
+                                             parallel_min_nodes=app.config['TSP_PARALLEL_MIN_NODES'])
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        if wants_drawing():
+            return jsonify({
+                'solution': solution,
+                'drawing': tsp_solution_drawing(graph_data, solution, G=snapshot.undirected, paths=snapshot.all_pairs,
+                                                pos=graph_layout(snapshot, snapshot.undirected))
+            })
+        image = render_graph(snapshot, visualize_tsp_solution, graph_data, solution, G=snapshot.undirected,
+                             paths=snapshot.all_pairs, pos=graph_layout(snapshot, snapshot.undirected))
         return jsonify({
             'solution': solution,
-            'image': image
+            'image': image.result()
         })
     
     return jsonify({
@@ -138,5 +358,77 @@ def hacker_optimizer():
         'default_nodes': '1,2,3,4'
     })
 
+# TSP - Anytime optimizer streaming improving tours
+@app.route('/hacker_optimizer/stream', methods=['POST'])
+def hacker_optimizer_stream():
+    snapshot = network_graph()
+    if snapshot.all_pairs.negative_cycle:
+        return jsonify({'status': 'error', 'message': NEGATIVE_CYCLE_MESSAGE}), 400
+    nodes = list(map(int, request.form.get('nodes', '1,2,3,4').split(',')))
+    nodes = [node for node in nodes if node in snapshot.all_pairs]
+    budget = float(request.form.get('budget_ms', app.config['TSP_ANYTIME_BUDGET_MS'])) / 1000
+    events = run_in_worker(anytime_tsp(snapshot.all_pairs, nodes, budget,
+                                       exact_max_nodes=app.config['TSP_EXACT_MAX_NODES'],
+                                       exact_memory_limit=app.config['TSP_EXACT_MEMORY_MB'] * 2**20))
+    
+    # Server-sent events for browsers, newline-delimited JSON otherwise
+    if request.accept_mimetypes.best == 'text/event-stream':
+        body = (f"event: {event['event']}\ndata: {json.dumps(event)}\n\n" for event in events)
+        mimetype = 'text/event-stream'
+    else:
+        body = (json.dumps(event) + '\n' for event in events)
+        mimetype = 'application/x-ndjson'
+    
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Benchmarks - timing sweeps over the algorithms package
+@app.route('/benchmarks', methods=['GET', 'POST'])
+def benchmarks():
+    # The sweep runs inside the request, so it stays small and never starts a process pool;
+    # the full suite is `python -m algorithms.benchmark`
+    web_benchmarks = [name for name, benchmark in BENCHMARKS.items() if not benchmark.processes]
+    if request.method == 'POST':
+        names = [name.strip() for name in request.form.get('names', '').split(',') if name.strip()]
+        cli_only = [name for name in names if name in BENCHMARKS and name not in web_benchmarks]
+        if cli_only:
+            return jsonify({
+                'status': 'error',
+                'message': f"{cli_only} start a process pool, run them with python -m algorithms.benchmark"
+            }), 400
+        try:
+            report = run_benchmarks(names or web_benchmarks,
+                                    min_size=int(request.form.get('min_size', 16)),
+                                    max_size=min(int(request.form.get('max_size', app.config['BENCHMARK_MAX_SIZE'])),
+                                                 app.config['BENCHMARK_MAX_SIZE']),
+                                    repeats=max(1, min(int(request.form.get('repeats', app.config['BENCHMARK_REPEATS'])),
+                                                       app.config['BENCHMARK_REPEATS'])),
+                                    seed=int(request.form.get('seed', 0)))
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        return jsonify({'status': 'success', **report})
+    
+    return jsonify({
+        'benchmarks': {name: BENCHMARKS[name].description for name in web_benchmarks},
+        'cli_only': [name for name in BENCHMARKS if name not in web_benchmarks],
+        'default_max_size': app.config['BENCHMARK_MAX_SIZE'],
+        'default_repeats': app.config['BENCHMARK_REPEATS']
+    })
+
+# Rendered figures, addressed by the SHA-256 of the PNG so they never change
+@app.route('/images/<digest>.png')
+def cached_image(digest):
+    if digest in request.if_none_match:
+        response = Response(status=304)
+    else:
+        png = image_cache.get_image(digest)
+        if png is None:
+            abort(404)
+        response = Response(png, mimetype='image/png')
+    
+    response.set_etag(digest)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 if __name__ == '__main__':
     app.run(debug=app.config['DEBUG'])
\ No newline at end of file
@@ -2,4 +2,38 @@
 DEBUG = True
 SECRET_KEY = 'cerberon_secret_key'
 DATA_FOLDER = 'data/'
-ALGORITHMS_FOLDER = 'algorithms/'
\ No newline at end of file
+ALGORITHMS_FOLDER = 'algorithms/'
+GRAPH_ENGINE = 'networkx'  # or 'csr' for the array-backed graph
+TSP_EXACT_MAX_NODES = 18  # Held-Karp is O(n^2 * 2^n)
+TSP_EXACT_MEMORY_MB = 256
+TSP_LOCAL_SEARCH_ITERATIONS = 100  # 2-opt/Or-opt sweeps on the heuristic tour, 0 disables
+TSP_LOCAL_SEARCH_MS = 200
+TSP_ANYTIME_BUDGET_MS = 500  # default budget for /hacker_optimizer/stream
+TSP_PARALLEL_WORKERS = 0  # multi-start worker processes, 0 = one per core, 1 = in-process
+TSP_PARALLEL_MIN_NODES = 64
+BELLMAN_FORD_ENGINE = 'auto'  # auto, classic, vectorized or spfa
+BELLMAN_FORD_MAX_CYCLES = 10  # distinct negative cycles reported per request
+GRAPH_LAYOUT = 'spring'  # spring, kamada_kawai or circular
+LAYOUT_CACHE_FOLDER = None  # e.g. 'cache/layouts/' to persist layouts across restarts
+RENDER_WORKERS = 2  # matplotlib render processes, 0 renders inside the request
+IMAGE_CACHE_FOLDER = 'cache/images/'  # rendered PNGs on disk, None keeps them in memory only
+IMAGE_CACHE_ENTRIES = 256  # PNGs kept in memory
+IMAGE_CACHE_DISK_ENTRIES = 4096  # PNGs (and render keys) kept on disk, least recently used go first
+PASSWORD_INDEX_FOLDER = 'cache/passwords/'  # sorted, memory-mapped copies of the wordlist
+PASSWORD_PREVIEW_LIMIT = 1000  # passwords listed by GET /password_attack
+PASSWORD_BATCH_LIMIT = 1000000  # candidates per /password_attack/batch request
+TRACE_LEVEL = 'full'  # step traces of the search/sort analyzers: off, summary, sampled or full
+TRACE_SAMPLE_EVERY = 10  # keep every Nth step when sampled
+BENCHMARK_MAX_SIZE = 256  # largest input /benchmarks may sweep to, bigger sweeps run from the command line
+BENCHMARK_REPEATS = 5  # timed samples per size for /benchmarks
+LOG_FILE = 'log_entries.txt'  # in DATA_FOLDER, may be gzip, bzip2 or xz compressed
+LOG_SORT_MODE = 'memory'  # or 'external' to sort logs larger than RAM through run files
+LOG_SORT_FOLDER = 'cache/sorted_logs/'  # where external mode writes the sorted logs
+LOG_SORT_CHUNK_SIZE = 100000  # records sorted in memory per run
+LOG_SORT_ENGINE = 'merge'  # merge, counting or radix ordering for /log_analyzer
+SORT_PARALLEL_WORKERS = 0  # processes for the parallel log sort engine, 0 = one per core
+SORT_PARALLEL_MIN_SIZE = 100000  # smaller logs are sorted in-process
+ANOMALY_MODE = 'sort'  # sort, select (introselect), heap (top-k) or stream (P-square estimate)
+ANOMALY_PERCENTILE = 0.9  # responses above this percentile are anomalies
+ANOMALY_SORT_ENGINE = 'quick'  # quick (teaching quick_sort) or intro (in-place iterative introsort)
+LOG_QUERY_LIMIT = 1000  # most records returned by one /logs/query
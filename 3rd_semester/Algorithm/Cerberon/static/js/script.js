@@ -57,7 +57,7 @@ function runPasswordAttack() {
         
         // Display binary search visualization
         const binaryImage = document.getElementById('binary-image');
-        binaryImage.src = `data:image/png;base64,${data.binary.image}`;
+        binaryImage.src = data.binary.image;
         
         // Display linear search results
         const linearResult = document.getElementById('linear-result');
@@ -70,7 +70,7 @@ function runPasswordAttack() {
         
         // Display linear search visualization
         const linearImage = document.getElementById('linear-image');
-        linearImage.src = `data:image/png;base64,${data.linear.image}`;
+        linearImage.src = data.linear.image;
     });
 }
 
@@ -84,11 +84,11 @@ function runLogAnalysis() {
             
             // Display time sorted logs
             document.getElementById('time-sorted-logs').textContent = data.sorted_by_time.join('\n');
-            document.getElementById('time-sort-image').src = `data:image/png;base64,${data.time_sort_image}`;
+            document.getElementById('time-sort-image').src = data.time_sort_image;
             
             // Display severity sorted logs
             document.getElementById('severity-sorted-logs').textContent = data.sorted_by_severity.join('\n');
-            document.getElementById('severity-sort-image').src = `data:image/png;base64,${data.severity_sort_image}`;
+            document.getElementById('severity-sort-image').src = data.severity_sort_image;
         });
 }
 
@@ -112,7 +112,7 @@ function showTraversal(traversalType) {
     document.getElementById('traversal-path').textContent = traversal.join(' → ');
     
     // Display visualization
-    document.getElementById('alert-tree-image').src = `data:image/png;base64,${alertAnalysisData.images[traversalType]}`;
+    document.getElementById('alert-tree-image').src = alertAnalysisData.images[traversalType];
 }
 
 // Phishing Redirect Tracker
@@ -161,7 +161,7 @@ function runPhishingTracker() {
     .then(response => response.json())
     .then(data => {
         // Display visualization
-        document.getElementById('phishing-graph-image').src = `data:image/png;base64,${data.image}`;
+        document.getElementById('phishing-graph-image').src = data.image;
         
         // Display BFS path
         const bfsPath = document.getElementById('bfs-path');
@@ -227,7 +227,7 @@ function runPathFinder() {
     .then(response => response.json())
     .then(data => {
         // Display visualization
-        document.getElementById('path-graph-image').src = `data:image/png;base64,${data.image}`;
+        document.getElementById('path-graph-image').src = data.image;
         
         // Display shortest path
         const shortestPath = document.getElementById('shortest-path');
@@ -289,7 +289,7 @@ function runDelayDetection() {
     .then(response => response.json())
     .then(data => {
         // Display visualization
-        document.getElementById('delay-graph-image').src = `data:image/png;base64,${data.image}`;
+        document.getElementById('delay-graph-image').src = data.image;
         
         // Display node distances
         const distances = document.getElementById('node-distances');
@@ -340,7 +340,7 @@ function runHackerOptimizer() {
     .then(response => response.json())
     .then(data => {
         // Display visualization
-        document.getElementById('hacker-graph-image').src = `data:image/png;base64,${data.image}`;
+        document.getElementById('hacker-graph-image').src = data.image;
         
         // Display optimal path
         const optimalPath = document.getElementById('optimal-path');